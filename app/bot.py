@@ -1,9 +1,12 @@
+import asyncio
 import logging
+from urllib.parse import urlparse
 
-from telebot import TeleBot
+from telebot import TeleBot, types
 
 from config import settings
-from app.utils.db_manager import init_db
+from app.utils.db_manager import init_db, async_init_db, get_session
+from app.database.repos import GameRepo
 from app.handlers.message import (
     GameMessageHandler,
     UnoWordHandler,
@@ -23,9 +26,17 @@ from app.handlers.commands import (
     UnoStartCommandHandler,
     TopCommandHandler,
 )
-from app.workers.timers import set_bot
+from app.workers.timers import set_bot, start_timer_recovery
+from app.workers.chat_actors import AsyncChatActors, set_chat_actors
+from app.workers.dispatcher import ShardedDispatcher
+from app.workers.outbox import outbox
 from app.workers.scheduler import start_scheduler
+from app.workers.webhook import WebhookServer
+from app.utils import metrics
 from app.utils.card_file_cache import ensure_sticker_set_cached
+from app.services.game_cache import game_cache
+from app.services.leaderboard_service import leaderboard
+from app.services.active_games import active_games
 
 
 logging.basicConfig(
@@ -34,13 +45,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger("bot")
 
+HANDLERS = (
+    StartCommandHandler,
+    UnoStartCommandHandler,
+    TopCommandHandler,
+    GameMessageHandler,
+    UnoWordHandler,
+    ProfileMessageHandler,
+    BotAddedHandler,
+    GameLobbyQueryHandler,
+    InlineHandQueryHandler,
+    StickerMoveHandler,
+    DrawCallbackHandler,
+    ColorChoiceCallbackHandler,
+    DumpAllCallbackHandler,
+)
+
+def prepare_storage() -> None:
+    with get_session() as s:
+        copied = GameRepo(s).backfill_user_groups()
+    if copied:
+        logger.info("Copied %s group memberships into user_groups", copied)
+    leaderboard.load()
+    with get_session(readonly=True) as s:
+        active = active_games.load(GameRepo(s).iter_playing_states())
+    logger.info("Indexed %s playing games", active)
+
+
+ALLOWED_UPDATES = [
+    "message",
+    "callback_query",
+    "inline_query",
+    "chosen_inline_result",
+    "my_chat_member",
+]
+
+
+def use_webhook() -> bool:
+    return settings.BOT_UPDATES == "webhook"
+
+
+def webhook_server(process) -> WebhookServer:
+    if not settings.WEBHOOK_URL:
+        raise RuntimeError("BOT_UPDATES=webhook needs WEBHOOK_URL.")
+    return WebhookServer(
+        process,
+        host=settings.WEBHOOK_HOST,
+        port=settings.WEBHOOK_PORT,
+        path=urlparse(settings.WEBHOOK_URL).path or "/",
+        secret=settings.WEBHOOK_SECRET,
+        queue_size=settings.WEBHOOK_QUEUE_SIZE,
+        workers=settings.WEBHOOK_WORKERS,
+    )
+
 
 class TelegramBot:
     def __init__(self) -> None:
-        self.bot = TeleBot(settings.BOT_TOKEN, parse_mode="HTML")
+        # webhook workers / dispatcher shards run the handlers themselves
+        self.bot = TeleBot(
+            settings.BOT_TOKEN,
+            parse_mode="HTML",
+            threaded=not (use_webhook() or settings.DISPATCH_SHARDS),
+        )
+        self.dispatcher: ShardedDispatcher | None = None
+        if settings.DISPATCH_SHARDS:
+            self.dispatcher = ShardedDispatcher(settings.DISPATCH_SHARDS)
+            self.dispatcher.attach(self.bot)
+            set_chat_actors(self.dispatcher)
 
-        start_scheduler()
+        start_scheduler().add_job(
+            metrics.log_snapshot,
+            trigger="interval",
+            seconds=settings.METRICS_LOG_SECONDS,
+            id="metrics_log",
+            replace_existing=True,
+        )
         set_bot(self.bot)
+        outbox.bind(lambda method, *a, **kw: getattr(self.bot, method)(*a, **kw))
+        if settings.OUTBOX:
+            outbox.start()
+
+        if game_cache.enabled:
+            game_cache.start()
 
         cache = ensure_sticker_set_cached(
             self.bot, getattr(settings, "STICKER_SET_NAME", "")
@@ -52,38 +138,141 @@ class TelegramBot:
 
     def _register_handlers(self) -> None:
         # Initialize each class handler that registers its decorators internally
-        StartCommandHandler(self.bot)
-        UnoStartCommandHandler(self.bot)
-        TopCommandHandler(self.bot)
-
-        GameMessageHandler(self.bot)
-        UnoWordHandler(self.bot)
-        ProfileMessageHandler(self.bot)
-        BotAddedHandler(self.bot)
-
-        GameLobbyQueryHandler(self.bot)
-        InlineHandQueryHandler(self.bot)
-        StickerMoveHandler(self.bot)
-        DrawCallbackHandler(self.bot)
-        ColorChoiceCallbackHandler(self.bot)
-        DumpAllCallbackHandler(self.bot)
+        for handler in HANDLERS:
+            handler(self.bot)
 
     def start(self) -> None:
         init_db()  # models already imported — tables will be created
+        prepare_storage()
+        start_timer_recovery()
 
         logger.info("TeleBot started…")
 
-        self.bot.remove_webhook()
-
-        self.bot.infinity_polling(
-            skip_pending=True,
-            timeout=20,
-            long_polling_timeout=25,
-            allowed_updates=[
-                "message",
-                "callback_query",
-                "inline_query",
-                "chosen_inline_result",
-                "my_chat_member",
-            ],
+        try:
+            if use_webhook():
+                self._serve_webhook()
+            else:
+                self.bot.remove_webhook()
+                self.bot.infinity_polling(
+                    skip_pending=True,
+                    timeout=20,
+                    long_polling_timeout=25,
+                    allowed_updates=ALLOWED_UPDATES,
+                )
+        finally:
+            if self.dispatcher is not None:
+                self.dispatcher.shutdown()
+            outbox.stop()
+            if game_cache.enabled:
+                game_cache.stop()  # final flush
+
+    def _serve_webhook(self) -> None:
+        server = webhook_server(
+            lambda update: self.bot.process_new_updates([types.Update.de_json(update)])
+        )
+        # pending updates are delivered, not dropped; retries are deduplicated
+        self.bot.set_webhook(
+            url=settings.WEBHOOK_URL,
+            secret_token=settings.WEBHOOK_SECRET or None,
+            allowed_updates=ALLOWED_UPDATES,
+            drop_pending_updates=False,
+        )
+        server.serve_forever()
+
+
+class AsyncTelegramBot:
+    """Same handlers on ``AsyncTeleBot`` with an async DB engine.
+
+    Handlers stay synchronous: ``SyncBotBridge`` runs each one in a greenlet
+    on the event loop, and sessions opened there use the async driver (see
+    ``db_manager.get_session``), so thousands of games can wait on Telegram or
+    the DB without a thread each. Updates are still serialized per chat through
+    ``AsyncChatActors``.
+    """
+
+    def __init__(self) -> None:
+        from telebot.async_telebot import AsyncTeleBot
+        from app.utils.async_bot_bridge import SyncBotBridge
+
+        self.async_bot = AsyncTeleBot(settings.BOT_TOKEN, parse_mode="HTML")
+        self.bot = SyncBotBridge(self.async_bot)
+
+    def _register_handlers(self) -> None:
+        for handler in HANDLERS:
+            handler(self.bot)
+
+    async def _main(self) -> None:
+        from sqlalchemy.util.concurrency import greenlet_spawn
+
+        set_chat_actors(AsyncChatActors(asyncio.get_running_loop()))
+        await async_init_db()
+        await greenlet_spawn(prepare_storage)
+
+        start_scheduler().add_job(
+            metrics.log_snapshot,
+            trigger="interval",
+            seconds=settings.METRICS_LOG_SECONDS,
+            id="metrics_log",
+            replace_existing=True,
+        )
+        # timer jobs fire on scheduler threads and hop onto the loop via the actors
+        set_bot(self.bot)
+        loop = asyncio.get_running_loop()
+        outbox.bind(
+            lambda method, *a, **kw: asyncio.run_coroutine_threadsafe(
+                getattr(self.async_bot, method)(*a, **kw), loop
+            ).result()
         )
+        # the outbox workers are threads; without them sends would block the loop
+        outbox.start()
+
+        if game_cache.enabled:
+            game_cache.start()
+
+        cache = await greenlet_spawn(
+            ensure_sticker_set_cached,
+            self.bot,
+            getattr(settings, "STICKER_SET_NAME", ""),
+        )
+        if not cache:
+            raise RuntimeError("Failed to cache sticker set; check STICKER_SET_NAME.")
+
+        self._register_handlers()
+        start_timer_recovery()
+
+        logger.info("AsyncTeleBot started…")
+        try:
+            if use_webhook():
+                await self._serve_webhook()
+            else:
+                await self.async_bot.remove_webhook()
+                await self.async_bot.infinity_polling(
+                    skip_pending=True,
+                    timeout=20,
+                    request_timeout=25,
+                    allowed_updates=ALLOWED_UPDATES,
+                )
+        finally:
+            await asyncio.to_thread(outbox.stop)
+            if game_cache.enabled:
+                await asyncio.to_thread(game_cache.stop)  # final flush
+            await self.async_bot.close_session()
+
+    async def _serve_webhook(self) -> None:
+        loop = asyncio.get_running_loop()
+        server = webhook_server(
+            lambda update: asyncio.run_coroutine_threadsafe(
+                self.async_bot.process_new_updates([types.Update.de_json(update)]),
+                loop,
+            ).result()
+        )
+        await self.async_bot.set_webhook(
+            url=settings.WEBHOOK_URL,
+            secret_token=settings.WEBHOOK_SECRET or None,
+            allowed_updates=ALLOWED_UPDATES,
+            drop_pending_updates=False,
+        )
+        await asyncio.to_thread(server.serve_forever)
+
+    def start(self) -> None:
+        asyncio.run(self._main())
@@ -13,22 +13,22 @@ class DataController:
             return obj
 
     def get_first(self, model_cls: Type, **filters):
-        with get_session() as s:
+        with get_session(readonly=True) as s:
             stmt = select(model_cls).filter_by(**filters).limit(1)
             return s.scalars(stmt).first()
 
     def get_all(self, model_cls: Type, **filters) -> list:
-        with get_session() as s:
+        with get_session(readonly=True) as s:
             stmt = select(model_cls).filter_by(**filters)
             return list(s.scalars(stmt))
 
     def get_all_in(self, model_cls: Type, field, values: list):
-        with get_session() as s:
+        with get_session(readonly=True) as s:
             stmt = select(model_cls).where(field.in_(values))
             return list(s.scalars(stmt))
 
     def count(self, model_cls: Type, **filters) -> int:
-        with get_session() as s:
+        with get_session(readonly=True) as s:
             stmt = select(func.count()).select_from(model_cls).filter_by(**filters)
             return s.scalar(stmt) or 0
 
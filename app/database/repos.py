@@ -1,8 +1,20 @@
 from __future__ import annotations
-from sqlalchemy import select, update
+from sqlalchemy import select, update, delete
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import Game, User, Group
+from config import Settings
+from app.models import Game, GameEvent, User, Group, UserGroup
+from app.services.card_codec import encode_state, decode_state
+from app.services.game_state import GameState
+from app.services import state_diff
+from app.services.game_cache import game_cache
+from app.services.leaderboard_service import leaderboard
+from app.services.inline_hand_cache import inline_hand_cache
+from app.services.game_service import GameService
+from app.services.hand_prebuilder import hand_prebuilder
+from app.services.active_games import active_games
+from app.utils import metrics
 
 
 class OptimisticLockError(Exception): ...
@@ -11,9 +23,99 @@ class OptimisticLockError(Exception): ...
 class GameRepo:
     def __init__(self, s: Session):
         self.s = s
+        self.events_mode = getattr(Settings, "GAME_PERSISTENCE", "snapshot") == "events"
+        self.snapshot_every = max(1, int(getattr(Settings, "GAME_SNAPSHOT_EVERY", 20)))
+        self.cache = game_cache if game_cache.enabled else None
 
     def get_by_chat(self, chat_id: int) -> Game | None:
-        return self.s.scalar(select(Game).where(Game.chat_id == chat_id))
+        if self.cache is not None:
+            entry = self.cache.get(chat_id)
+            if entry is not None:
+                # detached copy: callers mutate game.state freely before save()
+                return Game(
+                    id=entry.game_id,
+                    chat_id=entry.chat_id,
+                    status=entry.status,
+                    version=entry.version,
+                    state=GameState.from_json(
+                        decode_state(state_diff.copy_state(entry.state))
+                    ),
+                )
+
+        game = self.s.scalar(
+            select(Game)
+            .where(Game.chat_id == chat_id)
+            .execution_options(populate_existing=True)
+        )
+        if game is None:
+            return None
+
+        state = game.state or {}
+        snapshot_version = int(state.get("snapshot_version", game.version))
+        if game.version > snapshot_version:
+            # games.state is a snapshot; replay the moves made since then
+            for ops in self.s.scalars(
+                select(GameEvent.ops)
+                .where(
+                    GameEvent.game_id == game.id,
+                    GameEvent.version > snapshot_version,
+                )
+                .order_by(GameEvent.version)
+            ):
+                state_diff.apply(state, ops)
+
+        if self.events_mode or self.cache is not None:
+            persisted = (state_diff.copy_state(state), game.status)
+            if self.events_mode:
+                game._persisted = persisted
+            if self.cache is not None:
+                self.cache.put(
+                    chat_id,
+                    game.id,
+                    game.status,
+                    game.version,
+                    persisted[0],
+                    persisted if self.events_mode else None,
+                )
+
+        if state:
+            # compact card ids -> card dicts (legacy states are left as-is), then
+            # typed once for the engine; not a change the ORM should flush
+            set_committed_value(game, "state", GameState.from_json(decode_state(state)))
+        return game
+
+    def iter_playing_states(self, batch: int = 500):
+        """Yield ``(chat_id, state)`` of every playing game, streamed.
+
+        States are compact (not decoded) with pending events replayed; two
+        cursors ordered by game id are merged instead of a query per game.
+        """
+        games = self.s.execute(
+            select(Game.id, Game.chat_id, Game.version, Game.state)
+            .where(Game.status == "playing")
+            .order_by(Game.id)
+            .execution_options(yield_per=batch)
+        )
+        events = iter(
+            self.s.execute(
+                select(GameEvent.game_id, GameEvent.version, GameEvent.ops)
+                .join(Game, Game.id == GameEvent.game_id)
+                .where(Game.status == "playing")
+                .order_by(GameEvent.game_id, GameEvent.version)
+                .execution_options(yield_per=batch)
+            )
+        )
+        ev = next(events, None)
+        for game_id, chat_id, version, state in games:
+            state = state or {}
+            snapshot_version = int(state.get("snapshot_version", version))
+            while ev is not None and ev.game_id < game_id:
+                ev = next(events, None)
+            while ev is not None and ev.game_id == game_id:
+                if ev.version > snapshot_version:
+                    state_diff.apply(state, ev.ops)
+                ev = next(events, None)
+            yield chat_id, state
 
     def create_lobby(self, chat_id: int, title: str) -> Game:
         g = Game(
@@ -33,11 +135,21 @@ class GameRepo:
         self.s.add(g)
         self.s.commit()
         self.s.refresh(g)
+        inline_hand_cache.note_version(chat_id, g.id, g.version)
         return g
 
     def delete_lobby(self, game: Game) -> None:
-        self.s.delete(game)
+        # app.workers imports this module (timers -> repos)
+        from app.workers.live_table import live_table
+
+        if self.cache is not None:
+            self.cache.evict(game.chat_id)
+        self.s.execute(delete(GameEvent).where(GameEvent.game_id == game.id))
+        self.s.execute(delete(Game).where(Game.id == game.id))
         self.s.commit()
+        inline_hand_cache.forget(game.chat_id)
+        active_games.drop(game.chat_id)
+        live_table.forget(game.chat_id)
 
     def save(
         self,
@@ -49,16 +161,139 @@ class GameRepo:
     ) -> None:
         new_status = status if status is not None else game.status
         new_state = state if state is not None else game.state
+        new_version = expected_version + 1
+        # never persisted; they only drive the inline prebuild below
+        hand_changes = GameService.pop_hand_changes(new_state)
+        encoded = encode_state(new_state)
+
+        if self.cache is not None:
+            try:
+                entry = self.cache.apply(
+                    game.chat_id,
+                    expected_version,
+                    new_status,
+                    state_diff.copy_state(encoded),
+                )
+            except ValueError:
+                self.s.rollback()
+                metrics.inc("game_save_conflicts")
+                raise OptimisticLockError() from None
+
+            if entry is not None:
+                self._mark_saved(game, new_state, new_status, new_version)
+                if new_status not in ("lobby", "playing"):
+                    # game over: persist now instead of waiting for the flusher
+                    with self.cache.flush_lock:
+                        try:
+                            self.write_cached(self.cache.get(game.chat_id) or entry)
+                        finally:
+                            self.cache.evict(game.chat_id)
+                self.s.commit()
+                self._saved(game, new_version, new_status, encoded, hand_changes)
+                return
+
+        persisted = self._write(
+            game.id,
+            expected_version,
+            new_version,
+            new_status,
+            encoded,
+            getattr(game, "_persisted", None),
+        )
+        self._mark_saved(game, new_state, new_status, new_version)
+        self.s.commit()
+        self._saved(game, new_version, new_status, encoded, hand_changes)
+        if self.events_mode:
+            game._persisted = persisted
+
+    @staticmethod
+    def _saved(
+        game: Game, version: int, status: str, encoded: dict, hand_changes: list[int]
+    ) -> None:
+        inline_hand_cache.note_version(game.chat_id, game.id, version)
+        active_games.update(game.chat_id, status, encoded)
+        if status == "playing" and hand_prebuilder.enabled:
+            hand_prebuilder.submit(game.chat_id, game.id, version, encoded, hand_changes)
 
-        res = self.s.execute(
-            update(Game)
-            .where(Game.id == game.id, Game.version == expected_version)
-            .values(status=new_status, state=new_state, version=expected_version + 1)
+    def write_cached(self, entry) -> tuple[dict, str] | None:
+        """Write a ``CachedGame`` to the DB (used by the write-behind flusher)."""
+        persisted = self._write(
+            entry.game_id,
+            entry.db_version,
+            entry.version,
+            entry.status,
+            dict(entry.state),
+            entry.persisted,
         )
+        self.s.commit()
+        return persisted if self.events_mode else None
+
+    def _write(
+        self,
+        game_id: int,
+        expected_version: int,
+        new_version: int,
+        new_status: str,
+        encoded: dict,
+        persisted: tuple[dict, str] | None,
+    ) -> tuple[dict, str] | None:
+        as_event = False
+        if persisted is not None and self.events_mode:
+            base, base_status = persisted
+            snapshot_version = base.get("snapshot_version")
+            as_event = (
+                snapshot_version is not None
+                and base_status == new_status
+                and new_version - int(snapshot_version) < self.snapshot_every
+            )
+
+        if as_event:
+            encoded["snapshot_version"] = snapshot_version
+            res = self.s.execute(
+                update(Game)
+                .where(Game.id == game_id, Game.version == expected_version)
+                .values(version=new_version)
+            )
+            if res.rowcount == 1:
+                self.s.add(
+                    GameEvent(
+                        game_id=game_id,
+                        version=new_version,
+                        ops=state_diff.diff(base, encoded),
+                    )
+                )
+        else:
+            encoded["snapshot_version"] = new_version
+            res = self.s.execute(
+                update(Game)
+                .where(Game.id == game_id, Game.version == expected_version)
+                .values(status=new_status, state=encoded, version=new_version)
+            )
+            if res.rowcount == 1 and self.events_mode:
+                # compaction: everything up to the snapshot is in games.state now
+                self.s.execute(
+                    delete(GameEvent).where(
+                        GameEvent.game_id == game_id,
+                        GameEvent.version <= new_version,
+                    )
+                )
+
         if res.rowcount != 1:
             self.s.rollback()
+            metrics.inc("game_save_conflicts")
             raise OptimisticLockError()
-        self.s.commit()
+
+        if not self.events_mode:
+            return None
+        return (state_diff.copy_state(encoded), new_status)
+
+    @staticmethod
+    def _mark_saved(game: Game, state: dict, status: str, version: int) -> None:
+        # The row is already written (or owned by the cache); keep the ORM from
+        # flushing the dict-shaped state over the compact one on commit.
+        set_committed_value(game, "state", state)
+        set_committed_value(game, "status", status)
+        set_committed_value(game, "version", version)
 
     def add_player(self, game: Game, user_id: int) -> Game:
         state = game.state or {}
@@ -76,7 +311,7 @@ class GameRepo:
         state["players"] = players
         # ще можна прибрати руку
         hands = state.get("hands") or {}
-        hands.pop(str(user_id), None)
+        hands.pop(int(user_id), None)
         state["hands"] = hands
         game.state = state
         return game
@@ -87,10 +322,82 @@ class GameRepo:
         stmt = select(User).order_by(getattr(User, by).desc()).limit(limit)
 
         if group_id:
-            stmt = stmt.where(User.groups["groups"].contains([group_id]))
+            stmt = stmt.join(UserGroup, UserGroup.user_id == User.tg_id).where(
+                UserGroup.chat_id == group_id
+            )
 
         return self.s.scalars(stmt).all()
 
+    def add_members(self, chat_id: int, user_ids: list[int]) -> None:
+        """Record that ``user_ids`` play in ``chat_id`` (idempotent)."""
+        rows = [
+            {"user_id": int(uid), "chat_id": int(chat_id)}
+            for uid in dict.fromkeys(user_ids)
+        ]
+        if not rows:
+            return
+
+        dialect = self.s.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            # RETURNING yields only the rows actually inserted
+            new_ids = list(
+                self.s.scalars(
+                    insert(UserGroup)
+                    .values(rows)
+                    .on_conflict_do_nothing()
+                    .returning(UserGroup.user_id)
+                )
+            )
+        else:
+            existing = set(
+                self.s.scalars(
+                    select(UserGroup.user_id).where(
+                        UserGroup.chat_id == chat_id,
+                        UserGroup.user_id.in_([r["user_id"] for r in rows]),
+                    )
+                )
+            )
+            new_ids = [r["user_id"] for r in rows if r["user_id"] not in existing]
+            self.s.add_all(UserGroup(user_id=uid, chat_id=chat_id) for uid in new_ids)
+
+        if new_ids and leaderboard.active:
+            self._stage_members(chat_id, new_ids)
+
+    def _stage_members(self, chat_id: int, user_ids: list[int]) -> None:
+        # a new member can outrank the cached top of the group (and a brand-new
+        # user that of the global board)
+        self.s.flush()
+        leaderboard.stage(
+            self.s,
+            [
+                (tg, name, {"coins": coins, "xp": xp}, (int(chat_id),))
+                for tg, name, coins, xp in self.s.execute(
+                    select(User.tg_id, User.name, User.coins, User.xp).where(
+                        User.tg_id.in_(user_ids)
+                    )
+                )
+            ],
+        )
+
+    def backfill_user_groups(self) -> int:
+        """One-off copy of ``users.groups`` JSON into ``user_groups``."""
+        if self.s.scalar(select(UserGroup.user_id).limit(1)) is not None:
+            return 0
+
+        by_chat: dict[int, list[int]] = {}
+        for tg_id, groups in self.s.execute(select(User.tg_id, User.groups)):
+            for chat_id in (groups or {}).get("groups") or []:
+                by_chat.setdefault(int(chat_id), []).append(int(tg_id))
+
+        for chat_id, user_ids in by_chat.items():
+            self.add_members(chat_id, user_ids)
+        self.s.commit()
+        return sum(len(v) for v in by_chat.values())
+
     def get_group(self, chat_id: int) -> Group | None:
         return self.s.scalar(select(Group).where(Group.chat_id == chat_id))
     
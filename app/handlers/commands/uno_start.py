@@ -19,9 +19,10 @@ class UnoStartCommandHandler:
         self.settings = Settings()
         self.db = DataController()
 
-        def ensure_game(chat_id: int, title: str):
+        def ensure_game(chat_id: int, title: str, uid: int):
             with get_session() as s:
                 repo = GameRepo(s)
+                repo.add_members(chat_id, [uid])
                 game = repo.get_by_chat(chat_id)
 
                 if not game:
@@ -50,7 +51,7 @@ class UnoStartCommandHandler:
                         or str(uid)[-4:],
                     )
 
-                    lines.append(f"• {name} — {len(hands.get(str(uid), []))} карт")
+                    lines.append(f"• {name} — {len(hands.get(uid, []))} карт")
 
             if cur:
                 name = mention(
@@ -82,6 +83,7 @@ class UnoStartCommandHandler:
             game = ensure_game(
                 message.chat.id,
                 message.chat.title or "Група",
+                message.from_user.id,
             )
 
             msg = self.bot.send_message(
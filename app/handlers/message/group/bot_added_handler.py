@@ -2,6 +2,7 @@ from telebot import TeleBot, types as tp
 
 from app.models import Group
 from app.database.init_db import DataController
+from app.workers.outbox import outbox
 
 
 class BotAddedHandler:
@@ -25,7 +26,7 @@ class BotAddedHandler:
                 owner_id = self._get_owner_id(bot, chat_id) or 0
                 self.db.add(Group, chat_id=chat_id, title=chat.title, owner_id=owner_id)
 
-                bot.send_message(chat_id, "Привіт! Дякую, що додали мене 👋")
+                outbox.send(chat_id, "Привіт! Дякую, що додали мене 👋")
 
     def _get_owner_id(self, bot: TeleBot, chat_id: int) -> int | None:
         try:
@@ -10,7 +10,10 @@ from app.utils.db_manager import get_session
 from app.database.repos import GameRepo, OptimisticLockError
 from app.workers.timers import cancel_uno_timeout
 from app.utils.text_models import mention
+from app.utils.announce import refresh_table
 from app.services.game_service import GameService
+from app.workers.chat_actors import per_chat
+from app.workers.outbox import outbox, coalesced
 
 UNO_WORDS = {"uno", "уно", "uno!", "уно!"}
 
@@ -26,6 +29,8 @@ class UnoWordHandler:
             func=lambda m: bool(m.text) and m.text.strip().lower() in UNO_WORDS,
             chat_types=["group", "supergroup"],
         )
+        @per_chat(lambda m: m.chat.id)
+        @coalesced(lambda m: m.chat.id)
         def on_uno_word(message: tp.Message) -> None:
             chat_id = message.chat.id
             uid = message.from_user.id if message.from_user else 0
@@ -84,7 +89,7 @@ class UnoWordHandler:
                     name = (u.first_name if u and u.first_name else None) or (
                         ("@" + u.username) if u and u.username else str(uid)[-4:]
                     )
-                    self.bot.send_message(
+                    outbox.send(
                         chat_id,
                         f"✅ {mention(uid, name)} сказав <b>UNO</b>!",
                         parse_mode="HTML",
@@ -98,6 +103,8 @@ class UnoWordHandler:
                 try:
                     if str(state_after.get("status") or "").lower() == "finished":
                         return
+                    if refresh_table(self.kb, chat_id, state_after, self.svc, self.settings):
+                        return
 
                     top = state_after.get("top_card") or {}
                     cur_color = state_after.get("current_color")  # важливо для wild/p4
@@ -122,7 +129,7 @@ class UnoWordHandler:
                     color_key = cur_color if kind in ("wild", "p4") else top_color_raw
                     color_pretty = self.settings.colors.get(color_key, color_key)
 
-                    self.bot.send_message(
+                    outbox.send(
                         chat_id,
                         (
                             f"🃏 <b>Верхня карта:</b> {kind_pretty}\n"
@@ -8,14 +8,16 @@ from app.database.repos import GameRepo, OptimisticLockError
 from app.utils.db_manager import get_session
 from app.services.game_service import GameService
 from app.utils.text_models import mention
-from app.utils.announce import podium_lines
+from app.utils.announce import podium_lines, refresh_table
 from app.utils.level_up_notify import send_level_up_notifications
 from app.services.reward_service import apply_rewards_if_needed
+from app.workers.chat_actors import per_chat, chat_from_callback_data
 from app.workers.timers import (
     prepare_turn_timer,
     schedule_turn_timeout,
     cancel_turn_timeout,
 )
+from app.workers.outbox import outbox, coalesced
 
 
 class ColorChoiceCallbackHandler:
@@ -28,6 +30,8 @@ class ColorChoiceCallbackHandler:
         @bot.callback_query_handler(
             func=lambda c: bool(c.data) and c.data.startswith("color:")
         )
+        @per_chat(chat_from_callback_data)
+        @coalesced(chat_from_callback_data)
         def on_color_choice(call: tp.CallbackQuery) -> None:
             try:
                 _, chat_id_s, color = call.data.split(":", 2)
@@ -128,7 +132,7 @@ class ColorChoiceCallbackHandler:
                     meta = game_state.get("player_meta", {}) or {}
                     m = (meta or {}).get(str(ku), {}) if meta else {}
                     nm = m.get("name") or (("@" + m["username"]) if m.get("username") else str(ku)[-4:])
-                    self.bot.send_message(
+                    outbox.send(
                         chat_id,
                         f"🚫 {mention(ku, nm)} вибув(ла) з гри: у руці стало <b>{cards}</b> карт (ліміт 25).",
                         parse_mode="HTML",
@@ -154,10 +158,12 @@ class ColorChoiceCallbackHandler:
             except Exception:
                 pass
 
+            live = refresh_table(self.kb, chat_id, game_state, self.svc, self.settings)
+
             # якщо гра завершилась (наприклад, +4 кікнув і лишив 1 гравця) — просто оголошуємо переможця
             if str(game_state.get("status") or "").lower() == "finished":
                 try:
-                    self.bot.send_message(
+                    outbox.send(
                         chat_id,
                         "\n".join(podium_lines(game_state)),
                         parse_mode="HTML",
@@ -167,6 +173,8 @@ class ColorChoiceCallbackHandler:
                     pass
                 return
 
+            if live:
+                return
 
             try:
                 top = game_state.get("top_card") or {}
@@ -193,7 +201,7 @@ class ColorChoiceCallbackHandler:
                 if kind == "num":
                     kind = ""
 
-                self.bot.send_message(
+                outbox.send(
                     chat_id,
                     (
                         f"🎨 Колір обрано: {color}\n"
@@ -9,9 +9,11 @@ from app.utils.db_manager import get_session
 from app.database.repos import GameRepo, OptimisticLockError
 from app.services.game_service import GameService
 from app.utils.text_models import mention
-from app.utils.announce import podium_lines
+from app.utils.announce import podium_lines, refresh_table
+from app.utils.keyboards import Keyboards
 from app.utils.level_up_notify import send_level_up_notifications
 from app.services.reward_service import apply_rewards_if_needed
+from app.workers.chat_actors import per_chat, chat_from_callback_data
 from config import Settings
 
 from app.workers.timers import (
@@ -19,16 +21,20 @@ from app.workers.timers import (
     cancel_turn_timeout,
     prepare_turn_timer,
 )
+from app.workers.outbox import outbox, coalesced
 
 
 class DrawCallbackHandler:
     def __init__(self, bot: TeleBot) -> None:
         self.bot = bot
         self.svc = GameService()
+        self.kb = Keyboards()
 
         @bot.callback_query_handler(
             func=lambda c: bool(c.data) and c.data.startswith("draw:")
         )
+        @per_chat(chat_from_callback_data)
+        @coalesced(chat_from_callback_data)
         def on_draw(call: tp.CallbackQuery) -> None:
             _, chat_id_s = call.data.split(":", 1)
             chat_id = int(chat_id_s)
@@ -130,7 +136,7 @@ class DrawCallbackHandler:
                     meta = game_state.get("player_meta", {})  # best-effort
                     m = (meta or {}).get(str(ku), {}) if meta else {}
                     nm = m.get("name") or (("@" + m["username"]) if m.get("username") else str(ku)[-4:])
-                    self.bot.send_message(
+                    outbox.send(
                         chat_id,
                         f"🚫 <a href=\"tg://user?id={ku}\">{nm}</a> вибув(ла) з гри: у руці стало <b>{cards}</b> карт (ліміт 25).",
                         parse_mode="HTML",
@@ -148,10 +154,13 @@ class DrawCallbackHandler:
                     game_state.get("player_meta", {}) or {},
                 )
 
+            if game_state:
+                refresh_table(self.kb, chat_id, game_state, self.svc, Settings())
+
             # якщо гра завершилась під час цього draw (наприклад, кік залишив 1 гравця) — повідомимо
             if str(game_state.get("status") or "").lower() == "finished":
                 try:
-                    bot.send_message(
+                    outbox.send(
                         chat_id,
                         "\n".join(podium_lines(game_state)),
                         parse_mode="HTML",
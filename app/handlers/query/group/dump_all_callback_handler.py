@@ -11,6 +11,7 @@ from app.services.game_service import GameService
 from app.utils.announce import announce_after_move
 from app.utils.level_up_notify import send_level_up_notifications
 from app.services.reward_service import apply_rewards_if_needed
+from app.workers.chat_actors import per_chat, chat_from_callback_data
 from app.workers.timers import (
     prepare_turn_timer,
     schedule_turn_timeout,
@@ -20,6 +21,7 @@ from app.workers.timers import (
     cancel_uno_timeout,
     clear_uno_timer,
 )
+from app.workers.outbox import outbox, coalesced
 
 
 class DumpAllCallbackHandler:
@@ -32,6 +34,8 @@ class DumpAllCallbackHandler:
         @bot.callback_query_handler(
             func=lambda c: bool(c.data) and c.data.startswith("dump:")
         )
+        @per_chat(chat_from_callback_data)
+        @coalesced(chat_from_callback_data)
         def on_dump(call: tp.CallbackQuery) -> None:
             # dump:{chat_id}:{owner_uid}:{group}
             try:
@@ -128,8 +132,7 @@ class DumpAllCallbackHandler:
                             break
 
                         # UNO timer prepare/clear
-                        hand_after = (state.get("hands") or {}).get(str(uid), []) or []
-                        if len(hand_after) == 1:
+                        if self.svc.hand_size(state, uid) == 1:
                             suppress_announce_due_uno = True
                             uno_token = prepare_uno_timer(state, uid, seconds=10)
                             start_uno = (uid, uno_token, 10)
@@ -213,7 +216,7 @@ class DumpAllCallbackHandler:
                     meta = (announce_state or {}).get("player_meta", {}) if announce_state else {}
                     m = (meta or {}).get(str(ku), {}) if meta else {}
                     nm = m.get("name") or (("@" + m["username"]) if m.get("username") else str(ku)[-4:])
-                    self.bot.send_message(
+                    outbox.send(
                         chat_id,
                         f"🚫 {mention(ku, nm)} вибув(ла) з гри: у руці стало <b>{cards}</b> карт (ліміт 25).",
                         parse_mode="HTML",
@@ -233,7 +236,7 @@ class DumpAllCallbackHandler:
 
             if pending_color_msg is not None:
                 try:
-                    self.bot.send_message(
+                    outbox.send(
                         pending_color_msg[0],
                         pending_color_msg[1],
                         parse_mode="HTML",
@@ -248,7 +251,7 @@ class DumpAllCallbackHandler:
 
                 if uno_prompt_text:
                     try:
-                        self.bot.send_message(
+                        outbox.send(
                             chat_id,
                             uno_prompt_text,
                             parse_mode="HTML",
@@ -15,7 +15,9 @@ from app.workers.timers import (
 )
 from app.models import User
 from app.services.game_service import GameService
+from app.services.hand import Hand
 from app.database.init_db import DataController
+from app.workers.chat_actors import per_chat
 
 
 class GameLobbyQueryHandler:
@@ -50,6 +52,7 @@ class GameLobbyQueryHandler:
         @self.bot.callback_query_handler(
             func=lambda call: bool(call.data) and call.data.startswith("lobby:")
         )
+        @per_chat(lambda call: call.message.chat.id)
         def lobby_uno_query(call: tp.CallbackQuery) -> None:
             choice = call.data.split(":")[1]
             chat_id = call.message.chat.id
@@ -109,7 +112,7 @@ class GameLobbyQueryHandler:
 
                             # гарантуємо hands та запис
                             hands = state.get("hands") or {}
-                            hands.setdefault(str(uid), [])
+                            hands.setdefault(uid, Hand())
                             state["hands"] = hands
 
                             # якщо гра вже йде — видати 7 карт
@@ -121,6 +124,7 @@ class GameLobbyQueryHandler:
                             state["player_meta"] = pm
                             game.state = state
 
+                            repo.add_members(chat_id, [uid])
                             repo.save(
                                 game, expected_version=game.version, state=game.state
                             )
@@ -141,7 +145,7 @@ class GameLobbyQueryHandler:
                             state["player_meta"] = pm
 
                             hands = state.get("hands") or {}
-                            hands.pop(str(uid), None)
+                            hands.pop(uid, None)
                             state["hands"] = hands
 
                             game.state = state
@@ -215,6 +219,7 @@ class GameLobbyQueryHandler:
                                         created_at=datetime.now(),
                                     )
                                 )
+                            repo.add_members(chat_id, players)
 
                             self.bot.answer_callback_query(call.id, "🎮 Гру розпочато!")
                             break
@@ -8,10 +8,12 @@ from app.utils.db_manager import get_session
 from app.utils.card_file_cache import sticker_file_id_to_card_key
 from app.utils.text_models import mention
 from app.services.game_service import GameService
+from app.services.active_games import active_games, IGNORE, DELETE
 from app.utils.keyboards import Keyboards
 from app.utils.announce import announce_after_move
 from app.utils.level_up_notify import send_level_up_notifications
 from app.services.reward_service import apply_rewards_if_needed
+from app.workers.chat_actors import per_chat
 from app.workers.timers import (
     prepare_turn_timer,
     schedule_turn_timeout,
@@ -21,6 +23,9 @@ from app.workers.timers import (
     cancel_uno_timeout,
     clear_uno_timer,  # alias, або заміни на clear_uno_state
 )
+from app.workers.outbox import outbox, coalesced
+from app.workers.delete_batcher import delete_batcher
+from app.utils import metrics
 
 
 class StickerMoveHandler:
@@ -33,6 +38,8 @@ class StickerMoveHandler:
         @bot.message_handler(
             content_types=["sticker"], chat_types=["group", "supergroup"]
         )
+        @per_chat(lambda m: m.chat.id)
+        @coalesced(lambda m: m.chat.id)
         def on_sticker(message: tp.Message) -> None:
             chat_id = message.chat.id
             uid = message.from_user.id if message.from_user else 0
@@ -43,6 +50,14 @@ class StickerMoveHandler:
             if not card_key:
                 return
 
+            # most stickers in a busy group are not moves: decide without the DB
+            verdict = active_games.sticker_verdict(chat_id, uid)
+            if verdict in (IGNORE, DELETE):
+                metrics.inc("stickers_fast_rejected")
+                if verdict == DELETE:
+                    self._try_delete(chat_id, message.message_id)
+                return
+
             # дії після save
             start_turn: tuple[int, str, int] | None = None
             start_uno: tuple[int, str, int] | None = None
@@ -81,10 +96,7 @@ class StickerMoveHandler:
                             self._try_delete(chat_id, message.message_id)
                             return
 
-                        hand: list[dict] = (state.get("hands") or {}).get(
-                            str(uid), []
-                        ) or []
-                        idx = self._find_card_index_by_key(hand, card_key)
+                        idx = self.svc.hand_of(state, uid).find(card_key)
                         if idx is None:
                             self._try_delete(chat_id, message.message_id)
                             return
@@ -133,8 +145,7 @@ class StickerMoveHandler:
                             break
 
                         # -------- UNO timer prepare/clear (тільки в state, без schedule) --------
-                        hand_after = (state.get("hands") or {}).get(str(uid), []) or []
-                        if len(hand_after) == 1:
+                        if self.svc.hand_size(state, uid) == 1:
                             suppress_announce_due_uno = True
                             uno_token = prepare_uno_timer(state, uid, seconds=10)
                             start_uno = (uid, uno_token, 10)
@@ -209,7 +220,7 @@ class StickerMoveHandler:
                     meta = (announce_state or {}).get("player_meta", {}) if announce_state else {}
                     m = (meta or {}).get(str(ku), {}) if meta else {}
                     nm = m.get("name") or (("@" + m["username"]) if m.get("username") else str(ku)[-4:])
-                    self.bot.send_message(
+                    outbox.send(
                         chat_id,
                         f"🚫 {mention(ku, nm)} вибув(ла) з гри: у руці стало <b>{cards}</b> карт (ліміт 25).",
                         parse_mode="HTML",
@@ -236,7 +247,7 @@ class StickerMoveHandler:
 
             if pending_color_prompt:
                 try:
-                    self.bot.send_message(
+                    outbox.send(
                         pending_color_msg[0],
                         pending_color_msg[1],
                         parse_mode="HTML",
@@ -251,7 +262,7 @@ class StickerMoveHandler:
 
                 if uno_prompt_text:
                     try:
-                        self.bot.send_message(
+                        outbox.send(
                             chat_id,
                             uno_prompt_text,
                             parse_mode="HTML",
@@ -276,35 +287,5 @@ class StickerMoveHandler:
                     self.settings,
                 )
 
-    @staticmethod
-    def _find_card_index_by_key(hand: list[dict], card_key: str) -> int | None:
-        for i, c in enumerate(hand):
-            if StickerMoveHandler._dict_to_key(c) == card_key:
-                return i
-        return None
-
-    @staticmethod
-    def _dict_to_key(card: dict) -> str:
-        kind = str(card.get("kind") or "").lower()
-        val = card.get("value", None)
-        col = str(card.get("color") or "").lower()
-
-        if kind == "num":
-            return f"num:{int(val)}:{col}"
-        if kind in ("p2", "plus2"):
-            return f"p2:{col}"
-        if kind == "skip":
-            return f"skip:{col}"
-        if kind in ("rev", "reverse"):
-            return f"rev:{col}"
-        if kind == "wild":
-            return "wild"
-        if kind in ("p4", "plus4"):
-            return "p4"
-        return f"{kind}:{val}:{col}"
-
     def _try_delete(self, chat_id: int, message_id: int) -> None:
-        try:
-            self.bot.delete_message(chat_id, message_id)
-        except Exception:
-            pass
+        delete_batcher.delete(chat_id, message_id)
@@ -1,3 +1,5 @@
 from .user import User
 from .games import Game
-from .groups import Group
\ No newline at end of file
+from .game_events import GameEvent
+from .groups import Group
+from .user_groups import UserGroup
\ No newline at end of file
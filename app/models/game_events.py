@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sqlalchemy.types import JSON
+from sqlalchemy import Integer, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.utils.db_manager import Base
+
+
+class GameEvent(Base):
+    """One move of a game stored as a state diff (GAME_PERSISTENCE="events").
+
+    ``version`` is the ``games.version`` the move produced; events newer than
+    ``state["snapshot_version"]`` are replayed on top of ``games.state``.
+    """
+
+    __tablename__ = "game_events"
+    __table_args__ = (UniqueConstraint("game_id", "version"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    game_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    ops: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.utils.db_manager import Base
+
+
+class UserGroup(Base):
+    """Which group chats a player has played in (replaces ``users.groups`` JSON).
+
+    ``user_id`` is the Telegram id (``users.tg_id``). The primary key serves
+    "groups of a user", the second index serves group leaderboards.
+    """
+
+    __tablename__ = "user_groups"
+    __table_args__ = (Index("ix_user_groups_chat_user", "chat_id", "user_id"),)
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
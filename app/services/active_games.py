@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+
+from app.services.game_service import GameService
+from app.services.game_state import GameState
+
+# what to do with a card sticker, decided without loading the game
+IGNORE = "ignore"  # no game running here / sender is not a player
+DELETE = "delete"  # kicked player or not their turn
+UNKNOWN = "unknown"  # the index can't tell (not loaded yet): load the game
+
+
+@dataclass(slots=True, frozen=True)
+class ActiveGame:
+    players: frozenset[int]
+    kicked: frozenset[int]
+    current_uid: int | None
+
+
+class ActiveGameIndex:
+    """Playing chats with their players and whose turn it is.
+
+    ``GameRepo`` updates it on every committed save (start, moves, finish) and
+    on lobby deletion; ``load`` fills it once at startup. Before that, every
+    lookup answers ``UNKNOWN``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._games: dict[int, ActiveGame] = {}
+        self._loaded = False
+
+    @staticmethod
+    def _entry(state: dict) -> ActiveGame:
+        # current_player_id may normalize turn_idx: work on a shallow copy
+        view = GameState.from_json({
+            "players": state.get("players") or [],
+            "kicked": state.get("kicked") or {},
+            "turn_idx": state.get("turn_idx", 0),
+            "direction": state.get("direction", 1),
+        })
+        try:
+            current = int(GameService.current_player_id(view))
+        except ValueError:
+            current = None
+        return ActiveGame(
+            players=frozenset(view["players"]),
+            kicked=frozenset(view["kicked"]),
+            current_uid=current,
+        )
+
+    def load(self, states: Iterable[tuple[int, dict]]) -> int:
+        games = {int(chat_id): self._entry(state) for chat_id, state in states}
+        with self._lock:
+            # saves that raced the scan are newer than what it read
+            games.update(self._games)
+            self._games = games
+            self._loaded = True
+        return len(games)
+
+    def update(self, chat_id: int, status: str, state: dict) -> None:
+        if status != "playing":
+            self.drop(chat_id)
+            return
+        entry = self._entry(state)
+        with self._lock:
+            self._games[int(chat_id)] = entry
+
+    def drop(self, chat_id: int) -> None:
+        with self._lock:
+            self._games.pop(int(chat_id), None)
+
+    def sticker_verdict(self, chat_id: int, uid: int) -> str:
+        """``IGNORE``/``DELETE`` like the full handler would decide, else ``UNKNOWN``.
+
+        ``UNKNOWN`` also covers the current player: only the game can tell
+        whether the card is in their hand.
+        """
+        with self._lock:
+            if not self._loaded:
+                return UNKNOWN
+            game = self._games.get(int(chat_id))
+        if game is None:
+            return IGNORE
+        if uid in game.kicked:
+            return DELETE
+        if uid not in game.players:
+            return IGNORE
+        if game.current_uid != uid:
+            return DELETE
+        return UNKNOWN
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._games)
+
+
+active_games = ActiveGameIndex()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from app.services.deck_service import DeckService
+
+# Version of the persisted ``Game.state`` layout.
+#   1 (no "schema" key) - every card is a {"kind", "value", "color"} dict
+#   2                   - deck/discard/hands/top_card hold integer card ids
+# Seeded games (DECK_MODE="seeded") have no "deck" at all, only
+# deck_seed/deck_drawn/deck_returned.
+STATE_SCHEMA = 2
+
+_CARD_FIELDS = ("deck", "deck_returned", "discard")
+
+
+def _face(card) -> dict[str, Any]:
+    return {
+        "kind": card.kind.value,
+        "value": card.value,
+        "color": card.color.value,
+    }
+
+
+# card id -> card dict; ids follow DeckService.ordered_deck(), so the 108
+# physical cards of one game map to 0..107 (duplicates get distinct ids).
+CARDS: tuple[dict[str, Any], ...] = tuple(
+    _face(c) for c in DeckService().ordered_deck()
+)
+DECK_SIZE = len(CARDS)
+
+# (kind, value, color) -> lowest id with that face
+_ID_BY_FACE: dict[tuple, int] = {}
+for _i, _c in enumerate(CARDS):
+    _ID_BY_FACE.setdefault((_c["kind"], _c["value"], _c["color"]), _i)
+del _i, _c
+
+
+def card_id(card: dict[str, Any]) -> int:
+    """Id of a card dict. Identical faces share the lowest physical id."""
+    try:
+        return _ID_BY_FACE[(card.get("kind"), card.get("value"), card.get("color"))]
+    except KeyError:
+        raise ValueError(f"Unknown card: {card!r}") from None
+
+
+def card_from_id(cid: int) -> dict[str, Any]:
+    # fresh dict: the engine stores cards in state and must not share the table rows
+    return dict(CARDS[cid])
+
+
+def encode_cards(cards: Iterable[dict[str, Any]]) -> list[int]:
+    return [card_id(c) for c in cards]
+
+
+def decode_cards(ids: Iterable[int]) -> list[dict[str, Any]]:
+    return [dict(CARDS[i]) for i in ids]
+
+
+def is_compact(state: dict[str, Any] | None) -> bool:
+    return bool(state) and state.get("schema") == STATE_SCHEMA
+
+
+def encode_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of ``state`` with all cards replaced by integer ids.
+
+    The input is left untouched: handlers keep using the dict-shaped state after
+    ``GameRepo.save``.
+    """
+    out = dict(state)
+    if is_compact(state):
+        return out
+
+    for key in _CARD_FIELDS:
+        cards = state.get(key)
+        if isinstance(cards, list):
+            out[key] = encode_cards(cards)
+
+    # GameState keys hands/kicked by int uid; JSON object keys are strings
+    hands = state.get("hands")
+    if isinstance(hands, dict):
+        out["hands"] = {str(uid): encode_cards(h or []) for uid, h in hands.items()}
+    kicked = state.get("kicked")
+    if isinstance(kicked, dict):
+        out["kicked"] = {str(uid): meta for uid, meta in kicked.items()}
+
+    top = state.get("top_card")
+    out["top_card"] = card_id(top) if top else None
+
+    out["schema"] = STATE_SCHEMA
+    return out
+
+
+def decode_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Turn a compact state back into the dict-shaped one, in place.
+
+    Legacy (schema 1) states are returned as-is and get migrated on their next
+    save. Calling this twice on the same object is a no-op.
+    """
+    if not is_compact(state):
+        return state
+    from app.services.hand import Hand  # hand.py indexes cards by id from here
+
+    for key in _CARD_FIELDS:
+        ids = state.get(key)
+        if isinstance(ids, list):
+            state[key] = decode_cards(ids)
+
+    hands = state.get("hands")
+    if isinstance(hands, dict):
+        state["hands"] = {uid: Hand(decode_cards(h or [])) for uid, h in hands.items()}
+
+    top = state.get("top_card")
+    state["top_card"] = card_from_id(top) if top is not None else None
+
+    state.pop("schema", None)
+    return state
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import random
+from functools import lru_cache
+
 from app.domain.entities.card import Card, CardColor, CardKind
 
 COLORS: tuple[CardColor, ...] = (
@@ -10,9 +12,12 @@ COLORS: tuple[CardColor, ...] = (
     CardColor.yellow,
 )
 
+DECK_SIZE = 108
+
 
 class DeckService:
-    def build_deck(self) -> list[Card]:
+    def ordered_deck(self) -> list[Card]:
+        """All 108 cards in a fixed order (the card codec relies on it)."""
         deck: list[Card] = []
 
         for c in COLORS:
@@ -33,9 +38,25 @@ class DeckService:
             deck.append(Card(kind=CardKind.wild, value=None, color=CardColor.wild))
             deck.append(Card(kind=CardKind.p4, value=None, color=CardColor.wild))
 
+        return deck
+
+    def build_deck(self) -> list[Card]:
+        deck = self.ordered_deck()
         random.shuffle(deck)
         return deck
 
+    @staticmethod
+    def new_seed() -> int:
+        return random.getrandbits(48)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def seeded_order(seed: int) -> tuple[int, ...]:
+        """Shuffled card ids (see card_codec) for a seed; cards are drawn from the end."""
+        order = list(range(DECK_SIZE))
+        random.Random(seed).shuffle(order)
+        return tuple(order)
+
     def deal(
         self, deck: list[Card], players: list[int], hand_size: int = 7
     ) -> tuple[dict[int, list[Card]], list[Card]]:
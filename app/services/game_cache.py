@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+from config import Settings
+
+logger = logging.getLogger("game_cache")
+
+
+@dataclass(slots=True)
+class CachedGame:
+    game_id: int
+    chat_id: int
+    status: str
+    version: int
+    # compact (encoded) state; replaced on every save, never mutated in place
+    state: dict
+    db_version: int
+    # (encoded state, status) as last written to the DB; needed for event diffs
+    persisted: tuple[dict, str] | None = None
+    touched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def dirty(self) -> bool:
+        return self.version != self.db_version
+
+
+class GameCache:
+    """Authoritative in-process copy of live games, keyed by chat_id.
+
+    ``GameRepo`` serves ``get_by_chat`` from here and ``save`` only bumps the
+    in-memory version (same optimistic check as the DB). A background thread
+    writes dirty games every ``flush_seconds``; finished games are written
+    immediately by the repo. Only one bot process may own a database while the
+    cache is enabled.
+    """
+
+    def __init__(self, flush_seconds: float = 2.0, idle_seconds: float = 600.0) -> None:
+        self.flush_seconds = float(flush_seconds)
+        self.idle_seconds = float(idle_seconds)
+        self._lock = threading.Lock()
+        # serializes DB writes of cached games (flusher vs. game-end writes)
+        self.flush_lock = threading.Lock()
+        self._games: dict[int, CachedGame] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(Settings, "GAME_CACHE", False))
+
+    # -------------------- reads / writes --------------------
+
+    def get(self, chat_id: int) -> CachedGame | None:
+        with self._lock:
+            entry = self._games.get(int(chat_id))
+            if entry is not None:
+                entry.touched_at = time.monotonic()
+            return entry
+
+    def put(
+        self,
+        chat_id: int,
+        game_id: int,
+        status: str,
+        version: int,
+        state: dict,
+        persisted: tuple[dict, str] | None = None,
+    ) -> None:
+        """Register a game freshly loaded from the DB (``state`` is encoded)."""
+        with self._lock:
+            cur = self._games.get(int(chat_id))
+            if cur is not None and cur.dirty:
+                # in-memory copy is newer than the DB row; keep it
+                return
+            self._games[int(chat_id)] = CachedGame(
+                game_id=int(game_id),
+                chat_id=int(chat_id),
+                status=status,
+                version=int(version),
+                state=state,
+                db_version=int(version),
+                persisted=persisted,
+            )
+
+    def apply(
+        self, chat_id: int, expected_version: int, status: str, state: dict
+    ) -> CachedGame | None:
+        """Accept a save. Returns None if the game is not cached.
+
+        Raises ``ValueError`` on a version mismatch; the repo turns it into
+        ``OptimisticLockError``.
+        """
+        with self._lock:
+            entry = self._games.get(int(chat_id))
+            if entry is None:
+                return None
+            if entry.version != int(expected_version):
+                raise ValueError("stale version")
+            entry.state = state
+            entry.status = status
+            entry.version += 1
+            entry.touched_at = time.monotonic()
+            return entry
+
+    def mark_flushed(
+        self, chat_id: int, version: int, persisted: tuple[dict, str] | None
+    ) -> None:
+        with self._lock:
+            entry = self._games.get(int(chat_id))
+            if entry is None or entry.db_version >= version:
+                return
+            entry.db_version = int(version)
+            entry.persisted = persisted
+
+    def evict(self, chat_id: int) -> None:
+        with self._lock:
+            self._games.pop(int(chat_id), None)
+
+    def dirty_entries(self) -> list[CachedGame]:
+        with self._lock:
+            return [
+                CachedGame(
+                    game_id=e.game_id,
+                    chat_id=e.chat_id,
+                    status=e.status,
+                    version=e.version,
+                    state=e.state,
+                    db_version=e.db_version,
+                    persisted=e.persisted,
+                )
+                for e in self._games.values()
+                if e.dirty
+            ]
+
+    def _evict_idle(self) -> None:
+        deadline = time.monotonic() - self.idle_seconds
+        with self._lock:
+            for chat_id in [
+                k
+                for k, e in self._games.items()
+                if not e.dirty and e.touched_at < deadline
+            ]:
+                del self._games[chat_id]
+
+    # -------------------- write-behind --------------------
+
+    def flush(self) -> int:
+        """Write every dirty game to the DB. Returns the number written."""
+        from app.database.repos import GameRepo, OptimisticLockError
+        from app.utils.db_manager import get_session
+
+        written = 0
+        with self.flush_lock:
+            for entry in self.dirty_entries():
+                try:
+                    with get_session() as s:
+                        persisted = GameRepo(s).write_cached(entry)
+                except OptimisticLockError:
+                    # somebody wrote the row behind our back: the DB wins
+                    logger.warning(
+                        "Game %s changed in DB, dropping cached copy", entry.chat_id
+                    )
+                    self.evict(entry.chat_id)
+                    continue
+                except Exception:
+                    logger.exception("Failed to flush game %s", entry.chat_id)
+                    continue
+                self.mark_flushed(entry.chat_id, entry.version, persisted)
+                written += 1
+        return written
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+            self._evict_idle()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="game-cache-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_seconds + 1)
+        self._thread = None
+        self.flush()
+
+
+game_cache = GameCache(
+    flush_seconds=getattr(Settings, "GAME_CACHE_FLUSH_SECONDS", 2.0),
+)
+
@@ -5,6 +5,9 @@ from typing import Any
 import time
 
 from app.services.deck_service import DeckService
+from app.services.card_codec import card_from_id
+from app.services.game_state import GameState, PendingPhase
+from app.services.hand import Hand, group_key
 from config import Settings
 
 
@@ -30,24 +33,46 @@ class GameService:
             "color": cls._jsonable(getattr(c, "color", None)),
         }
 
-    def start_game_state(self, player_ids: list[int]) -> dict[str, Any]:
-        deck = self.deck.build_deck()
-        hands_by_uid, deck = self.deck.deal(deck, players=player_ids, hand_size=7)
+    def start_game_state(
+        self, player_ids: list[int], seed: int | None = None
+    ) -> GameState:
+        """Fresh game state.
 
-        hands: dict[str, list[dict[str, Any]]] = {}
-        for uid in player_ids:
-            hands[str(uid)] = [
-                self.card_to_dict(c) for c in (hands_by_uid.get(uid) or [])
-            ]
+        With ``DECK_MODE == "seeded"`` (or an explicit ``seed``) the draw pile is
+        not stored: it is derived from ``deck_seed`` and the ``deck_drawn`` cursor,
+        so a whole game can be replayed from its seed.
+        """
+        seeded = seed is not None or getattr(Settings, "DECK_MODE", "seeded") == "seeded"
 
-        return {
+        if seeded:
+            deck_state: dict[str, Any] = {
+                "deck_seed": int(seed if seed is not None else self.deck.new_seed()),
+                "deck_drawn": 0,
+                "deck_returned": [],
+            }
+            hands: dict[int, Hand] = {uid: Hand() for uid in player_ids}
+            for _ in range(7):
+                for uid in player_ids:
+                    hands[uid].append(self._pop_deck(deck_state))
+        else:
+            deck = self.deck.build_deck()
+            hands_by_uid, deck = self.deck.deal(deck, players=player_ids, hand_size=7)
+
+            hands = {}
+            for uid in player_ids:
+                hands[uid] = Hand(
+                    self.card_to_dict(c) for c in (hands_by_uid.get(uid) or [])
+                )
+            deck_state = {"deck": [self.card_to_dict(c) for c in deck]}
+
+        return GameState.from_json({
             "players": player_ids,
             "status": "playing",
             "turn_idx": 0,
             "direction": 1,
             "top_card": None,
             "current_color": None,
-            "deck": [self.card_to_dict(c) for c in deck],
+            **deck_state,
             "discard": [],
             "hands": hands,
             "timers": {},
@@ -61,24 +86,23 @@ class GameService:
             "rewards_applied": False,
             "level_ups": {},
             "level_ups_notified": False,
-            "events": [],
-        }
+            "events": [{"type": "HAND", "uid": int(uid)} for uid in player_ids],
+        })
 
     # -------------------- helpers --------------------
 
     @classmethod
-    def current_player_id(cls, state: dict[str, Any]) -> int:
+    def current_player_id(cls, state: GameState) -> int:
         """Return current active player id.
 
         If turn_idx currently points at a kicked player, normalize turn_idx to the
         next active player (in current direction).
         """
-        players = state.get("players") or []
+        players, turn_idx, direction = state.turn
         if not players:
             raise ValueError("No players")
 
-        idx0 = int(state.get("turn_idx", 0) or 0) % len(players)
-        direction = int(state.get("direction", 1) or 1)
+        idx0 = turn_idx % len(players)
         idx = cls._find_next_active_index(state, start_idx=idx0, direction=direction)
         if idx is None:
             raise ValueError("No active players")
@@ -87,12 +111,11 @@ class GameService:
         return int(players[idx])
 
     @staticmethod
-    def _has_pending_color(state: dict[str, Any]) -> bool:
-        pc = state.get("pending_color")
-        return bool(pc and pc.get("active") and not pc.get("resolved"))
+    def _has_pending_color(state: GameState) -> bool:
+        return state.pending(PendingPhase.COLOR) is not None
 
     @staticmethod
-    def _set_pending_color(state: dict[str, Any], uid: int, kind: str) -> None:
+    def _set_pending_color(state: GameState, uid: int, kind: str) -> None:
         state["pending_color"] = {
             "active": True,
             "resolved": False,
@@ -101,34 +124,32 @@ class GameService:
         }
 
     @staticmethod
-    def _clear_pending_color(state: dict[str, Any]) -> None:
-        pc = state.get("pending_color") or {}
-        pc["active"] = False
-        pc["resolved"] = True
-        state["pending_color"] = pc
+    def _clear_pending_color(state: GameState) -> None:
+        pc = state.pending(PendingPhase.COLOR)
+        if pc is not None:
+            pc["active"] = False
+            pc["resolved"] = True
 
     @classmethod
-    def _next_player_id(cls, state: dict[str, Any]) -> int:
-        players = state.get("players") or []
+    def _next_player_id(cls, state: GameState) -> int:
+        players, turn_idx, direction = state.turn
         if not players:
             raise ValueError("No players")
-        idx0 = int(state.get("turn_idx", 0) or 0) % len(players)
-        direction = int(state.get("direction", 1) or 1)
+        idx0 = turn_idx % len(players)
         idx = cls._find_next_active_index(state, start_idx=(idx0 + direction) % len(players), direction=direction)
         if idx is None:
             raise ValueError("No active players")
         return int(players[idx])
 
     @classmethod
-    def _advance_turn(cls, state: dict[str, Any], steps: int = 1) -> None:
-        players = state.get("players") or []
+    def _advance_turn(cls, state: GameState, steps: int = 1) -> None:
+        players, idx, direction = state.turn
         if not players:
             return
 
-        direction = int(state.get("direction", 1) or 1)
         # advance by "active" steps
         for _ in range(max(1, int(steps))):
-            idx0 = int(state.get("turn_idx", 0) or 0) % len(players)
+            idx0 = idx % len(players)
             idx = cls._find_next_active_index(
                 state,
                 start_idx=(idx0 + direction) % len(players),
@@ -138,16 +159,52 @@ class GameService:
                 return
             state["turn_idx"] = idx
 
+    # -------------------- deck --------------------
+
+    @staticmethod
+    def _pop_deck(state: dict[str, Any]) -> dict[str, Any] | None:
+        """Take the next card from the draw pile (stored list or seeded order)."""
+        if "deck_seed" not in state:
+            deck = state.get("deck") or []
+            return deck.pop() if deck else None
+
+        returned = state.get("deck_returned") or []
+        if returned:
+            return returned.pop()
+
+        drawn = int(state.get("deck_drawn") or 0)
+        order = DeckService.seeded_order(int(state["deck_seed"]))
+        if drawn >= len(order):
+            return None
+        state["deck_drawn"] = drawn + 1
+        return card_from_id(order[-1 - drawn])
+
+    @staticmethod
+    def return_to_deck(state: dict[str, Any], card: dict[str, Any]) -> None:
+        """Put a card back on top of the draw pile."""
+        if "deck_seed" in state:
+            state.setdefault("deck_returned", []).append(card)
+        else:
+            state.setdefault("deck", []).append(card)
+
+    @staticmethod
+    def deck_size(state: dict[str, Any]) -> int:
+        if "deck_seed" not in state:
+            return len(state.get("deck") or [])
+        drawn = int(state.get("deck_drawn") or 0)
+        remaining = len(DeckService.seeded_order(int(state["deck_seed"]))) - drawn
+        return max(0, remaining) + len(state.get("deck_returned") or [])
+
     @classmethod
-    def draw_one(cls, state: dict[str, Any], uid: int) -> None:
+    def draw_one(cls, state: GameState, uid: int) -> None:
         # kicked player can no longer receive cards
         if cls.is_kicked(state, uid):
             return
-        deck = state.get("deck") or []
-        if not deck:
+        card = cls._pop_deck(state)
+        if card is None:
             return
-        card = deck.pop()
-        state.setdefault("hands", {}).setdefault(str(uid), []).append(card)
+        state["hands"].setdefault(uid, Hand()).append(card)
+        cls._record_hand_change(state, uid)
         cls.enforce_hand_limit(state, uid)
 
     # -------------------- kicked / limits --------------------
@@ -157,62 +214,67 @@ class GameService:
         return time.time()
 
     @classmethod
-    def is_kicked(cls, state: dict, uid: int) -> bool:
-        return str(uid) in (state.get("kicked") or {})
+    def is_kicked(cls, state: GameState, uid: int) -> bool:
+        return uid in state["kicked"]
 
     @classmethod
-    def active_players(cls, state: dict) -> list[int]:
-        players = state.get("players") or []
-        kicked = state.get("kicked") or {}
-        return [int(uid) for uid in players if str(uid) not in kicked]
+    def active_players(cls, state: GameState) -> list[int]:
+        kicked = state["kicked"]
+        return [uid for uid in state["players"] if uid not in kicked]
+
+    @staticmethod
+    def hand_of(state: GameState, uid: int) -> Hand:
+        """The player's hand (a player without one gets an empty, unattached ``Hand``)."""
+        hand = state["hands"].get(uid)
+        return Hand() if hand is None else hand
 
     @classmethod
-    def hand_size(cls, state: dict, uid: int) -> int:
-        hands = state.get("hands") or {}
-        return len(hands.get(str(uid), []) or [])
+    def hand_size(cls, state: GameState, uid: int) -> int:
+        hand = state["hands"].get(uid)
+        return 0 if hand is None else len(hand)
 
     @classmethod
     def _find_next_active_index(
-        cls, state: dict, start_idx: int, direction: int
+        cls, state: GameState, start_idx: int, direction: int
     ) -> int | None:
-        players = state.get("players") or []
+        players = state["players"]
         if not players:
             return None
-        kicked = state.get("kicked") or {}
+        kicked = state["kicked"]
         n = len(players)
-        idx = int(start_idx) % n
-        step = 1 if int(direction) >= 0 else -1
+        idx = start_idx % n
+        if not kicked:
+            return idx
+        step = 1 if direction >= 0 else -1
 
         for _ in range(n):
             uid = players[idx]
-            if str(uid) not in kicked:
+            if uid not in kicked:
                 return idx
             idx = (idx + step) % n
         return None
 
     @classmethod
-    def _normalize_turn_idx(cls, state: dict) -> None:
+    def _normalize_turn_idx(cls, state: GameState) -> None:
         """If turn_idx points to kicked user, shift to next active."""
-        players = state.get("players") or []
+        players, turn_idx, direction = state.turn
         if not players:
             return
-        idx0 = int(state.get("turn_idx", 0) or 0) % len(players)
-        direction = int(state.get("direction", 1) or 1)
+        idx0 = turn_idx % len(players)
         idx = cls._find_next_active_index(state, start_idx=idx0, direction=direction)
         if idx is not None:
             state["turn_idx"] = idx
 
     @classmethod
-    def clear_uno_for_uid(cls, state: dict, uid: int) -> None:
-        up = state.get("uno_pending") or {}
-        if up.get("active") and not up.get("resolved") and int(up.get("player_id", 0)) == int(uid):
+    def clear_uno_for_uid(cls, state: GameState, uid: int) -> None:
+        if state.pending_uid(PendingPhase.UNO) == int(uid):
+            up = state.pending(PendingPhase.UNO)
             up["active"] = False
             up["resolved"] = True
-            state["uno_pending"] = up
             state.setdefault("timers", {})["uno"] = {}
 
     @classmethod
-    def _record_kick_event(cls, state: dict, uid: int, cards: int) -> None:
+    def _record_kick_event(cls, state: GameState, uid: int, cards: int) -> None:
         ev = {
             "type": "KICK",
             "uid": int(uid),
@@ -222,7 +284,7 @@ class GameService:
         state.setdefault("events", []).append(ev)
 
     @classmethod
-    def pop_kick_events(cls, state: dict) -> list[dict]:
+    def pop_kick_events(cls, state: GameState) -> list[dict]:
         events = state.get("events") or []
         kicks = [e for e in events if e.get("type") == "KICK"]
         if kicks:
@@ -230,10 +292,24 @@ class GameService:
         return kicks
 
     @classmethod
-    def kick_player(cls, state: dict, uid: int, reason: str, *, cards_at_kick: int | None = None) -> None:
-        kicked = state.get("kicked") or {}
-        if str(uid) in kicked:
-            state["kicked"] = kicked
+    def _record_hand_change(cls, state: GameState, uid: int) -> None:
+        events = state.setdefault("events", [])
+        if not any(e.get("type") == "HAND" and e.get("uid") == int(uid) for e in events):
+            events.append({"type": "HAND", "uid": int(uid)})
+
+    @classmethod
+    def pop_hand_changes(cls, state: GameState) -> list[int]:
+        """Players whose hand changed since the last call (for inline prebuilds)."""
+        events = state.get("events") or []
+        uids = [int(e["uid"]) for e in events if e.get("type") == "HAND"]
+        if uids:
+            state["events"] = [e for e in events if e.get("type") != "HAND"]
+        return uids
+
+    @classmethod
+    def kick_player(cls, state: GameState, uid: int, reason: str, *, cards_at_kick: int | None = None) -> None:
+        kicked = state["kicked"]
+        if uid in kicked:
             return
 
         if cards_at_kick is None:
@@ -250,9 +326,8 @@ class GameService:
             idx_kick = None
 
         # Drop hand so they no longer appear with card count / can open hand.
-        hands = state.get("hands") or {}
-        hands.pop(str(uid), None)
-        state["hands"] = hands
+        state["hands"].pop(uid, None)
+        cls._record_hand_change(state, uid)
 
         # Also drop any per-player flags/penalties for cleanliness.
         (state.get("penalties") or {}).pop(str(uid), None)
@@ -277,26 +352,24 @@ class GameService:
             else:
                 state["turn_idx"] = 0
 
-        kicked[str(uid)] = {
+        kicked[uid] = {
             "reason": reason,
             "cards": int(cards_at_kick),
             "ts": cls.now_ts(),
         }
-        state["kicked"] = kicked
 
         # cleanup UNO if needed
         cls.clear_uno_for_uid(state, uid)
 
         # If pending_color belonged to the kicked player (rare), clear it so the game cannot get stuck.
-        pc = state.get("pending_color") or {}
-        if pc.get("active") and not pc.get("resolved") and int(pc.get("player_id", 0) or 0) == int(uid):
+        if state.pending_uid(PendingPhase.COLOR) == int(uid):
             cls._clear_pending_color(state)
 
         cls.finish_player(state, uid, reason=reason)
         cls._maybe_finish_game(state)
 
     @classmethod
-    def enforce_hand_limit(cls, state: dict, uid: int) -> bool:
+    def enforce_hand_limit(cls, state: GameState, uid: int) -> bool:
         """Return True if player was newly kicked due to hand limit."""
         if cls.is_kicked(state, uid):
             return False
@@ -309,7 +382,7 @@ class GameService:
         return False
 
     @classmethod
-    def finish_player(cls, state: dict, uid: int, reason: str) -> None:
+    def finish_player(cls, state: GameState, uid: int, reason: str) -> None:
         placements = state.setdefault("placements", [])
         if int(uid) not in placements:
             placements.append(int(uid))
@@ -333,14 +406,13 @@ class GameService:
             else:
                 state["turn_idx"] = 0
 
-        hands = state.get("hands") or {}
-        hands.pop(str(uid), None)
-        state["hands"] = hands
+        state["hands"].pop(uid, None)
+        cls._record_hand_change(state, uid)
 
         state.setdefault("finished_meta", {})[str(uid)] = {"reason": reason}
 
     @classmethod
-    def _maybe_finish_game(cls, state: dict) -> None:
+    def _maybe_finish_game(cls, state: GameState) -> None:
         players = state.get("players") or []
         if len(players) <= 1:
             if players:
@@ -377,22 +449,20 @@ class GameService:
 
     @classmethod
     def play_card(
-        cls, state: dict[str, Any], uid: int, card_index: int
+        cls, state: GameState, uid: int, card_index: int
     ) -> tuple[bool, str]:
         if cls.is_kicked(state, uid):
             return False, "Ти вибув(ла) з цієї гри до завершення (ліміт карт)."
 
         if cls._has_pending_color(state):
-            pc = state.get("pending_color") or {}
-            if int(pc.get("player_id", 0)) == int(uid):
+            if state.pending_uid(PendingPhase.COLOR) == int(uid):
                 return False, "Спочатку обери колір для Wild/+4."
             return False, "Очікуємо вибір кольору іншим гравцем."
 
         if cls.current_player_id(state) != uid:
             return False, "Зараз не твій хід."
 
-        hands = state.get("hands") or {}
-        hand = hands.get(str(uid)) or []
+        hand = cls.hand_of(state, uid)
         if card_index < 0 or card_index >= len(hand):
             return False, "Карта не знайдена."
 
@@ -407,6 +477,7 @@ class GameService:
 
         # зіграли карту
         hand.pop(card_index)
+        cls._record_hand_change(state, uid)
         state.setdefault("discard", []).append(card)
         state["top_card"] = card
 
@@ -430,11 +501,10 @@ class GameService:
                 "said": False,
             }
         else:
-            up = state.get("uno_pending") or {}
-            if up.get("active") and not up.get("resolved"):
+            up = state.pending(PendingPhase.UNO)
+            if up is not None:
                 up["active"] = False
                 up["resolved"] = True
-                state["uno_pending"] = up
 
         # спец-логіка
         if kind in ("wild", "p4"):
@@ -469,12 +539,12 @@ class GameService:
     # -------------------- choose_color --------------------
 
     @classmethod
-    def choose_color(cls, state: dict[str, Any], uid: int, color: str) -> tuple[bool, str]:
+    def choose_color(cls, state: GameState, uid: int, color: str) -> tuple[bool, str]:
         if cls.is_kicked(state, uid):
             return False, "Ти вибув(ла) з цієї гри до завершення (ліміт карт)."
 
-        pc = state.get("pending_color") or {}
-        if not pc.get("active") or pc.get("resolved"):
+        pc = state.pending(PendingPhase.COLOR)
+        if pc is None:
             return False, "Немає активного вибору кольору."
 
         if int(pc.get("player_id", 0)) != int(uid):
@@ -504,7 +574,7 @@ class GameService:
     # -------------------- draw --------------------
 
     @classmethod
-    def draw_card_and_pass(cls, state: dict, uid: int) -> tuple[bool, str]:
+    def draw_card_and_pass(cls, state: GameState, uid: int) -> tuple[bool, str]:
         if cls._has_pending_color(state):
             return False, "Очікуємо вибір кольору."
 
@@ -528,7 +598,7 @@ class GameService:
 
     # -------------------- penalties / skips --------------------
 
-    def apply_penalty(self, state: dict, uid: int, reason: str, cards: int = 2) -> None:
+    def apply_penalty(self, state: GameState, uid: int, reason: str, cards: int = 2) -> None:
         for _ in range(cards):
             self.draw_one(state, uid)
         state.setdefault("last_penalty", {})[str(uid)] = {
@@ -537,7 +607,7 @@ class GameService:
         }
 
     def apply_penalty_and_skip_if_possible(
-        self, state: dict, uid: int, reason: str, cards: int = 2
+        self, state: GameState, uid: int, reason: str, cards: int = 2
     ) -> bool:
         self.apply_penalty(state, uid, reason, cards=cards)
 
@@ -557,7 +627,7 @@ class GameService:
         state["penalties"][str(uid)] = pen
         return False
 
-    def consume_skip_if_marked(self, state: dict) -> bool:
+    def consume_skip_if_marked(self, state: GameState) -> bool:
         uid = self.current_player_id(state)
         pen = (state.get("penalties") or {}).get(str(uid)) or {}
         if pen.get("skip_next_turn"):
@@ -569,49 +639,39 @@ class GameService:
 
     @staticmethod
     def group_key(card: dict[str, Any]) -> str:
-        kind = str(card.get("kind") or "").lower()
-        if kind == "num":
-            return f"num:{int(card.get('value') or 0)}"  # ✅ група по значенню
-        if kind in ("skip", "rev", "p2", "wild", "p4"):
-            return kind
-        # fallback
-        return kind
+        return group_key(card)
 
     @classmethod
-    def play_group_dump(cls, state: dict[str, Any], uid: int, group: str) -> tuple[bool, str]:
+    def play_group_dump(cls, state: GameState, uid: int, group: str) -> tuple[bool, str]:
         if cls.is_kicked(state, uid):
             return False, "Ти вибув(ла) з цієї гри до завершення (ліміт карт)."
 
         # pending_color блокує будь-що
         if cls._has_pending_color(state):
-            pc = state.get("pending_color") or {}
-            if int(pc.get("player_id", 0)) == int(uid):
+            if state.pending_uid(PendingPhase.COLOR) == int(uid):
                 return False, "Спочатку обери колір для Wild/+4."
             return False, "Очікуємо вибір кольору іншим гравцем."
 
         if cls.current_player_id(state) != uid:
             return False, "Зараз не твій хід."
 
-        hands = state.get("hands") or {}
-        hand: list[dict[str, Any]] = hands.get(str(uid)) or []
+        hand = cls.hand_of(state, uid)
         if not hand:
             return False, "В тебе немає карт."
 
-        idxs = [i for i, c in enumerate(hand) if cls.group_key(c) == group]
-        if len(idxs) < 2:
+        if hand.group_counts.get(group, 0) < 2:
             return False, "Немає 2+ карт цього типу."
 
         # Перша карта має бути зіграбельна
-        first_card = hand[idxs[0]]
+        first_card = hand.first_of_group(group)
         top = state.get("top_card")
         current_color = state.get("current_color")
         if not cls.can_play(first_card, top, current_color):
             return False, "Першу з цих карт зараз не можна зіграти."
 
         # Скидаємо всі карти групи
-        to_play = [hand[i] for i in idxs]
-        for i in sorted(idxs, reverse=True):
-            hand.pop(i)
+        to_play = hand.take_group(group)
+        cls._record_hand_change(state, uid)
 
         state.setdefault("discard", []).extend(to_play)
         last = to_play[-1]
@@ -638,11 +698,10 @@ class GameService:
                 "said": False,
             }
         else:
-            up = state.get("uno_pending") or {}
-            if up.get("active") and not up.get("resolved"):
+            up = state.pending(PendingPhase.UNO)
+            if up is not None:
                 up["active"] = False
                 up["resolved"] = True
-                state["uno_pending"] = up
 
         n = len(to_play)
 
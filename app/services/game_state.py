@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from enum import Flag
+from typing import Any
+
+from app.services.hand import Hand, face_id
+
+
+class PendingPhase(Flag):
+    """What the game is waiting for besides a normal move (both can be open)."""
+
+    NONE = 0
+    COLOR = 1  # a Wild/+4 was played, its player picks the colour
+    UNO = 2  # a player is down to one card and has not said UNO yet
+
+
+_PHASES = (
+    PendingPhase.NONE,
+    PendingPhase.COLOR,
+    PendingPhase.UNO,
+    PendingPhase.COLOR | PendingPhase.UNO,
+)
+
+
+def _open(pending: dict[str, Any] | None) -> bool:
+    return bool(pending and pending.get("active") and not pending.get("resolved"))
+
+
+class GameState(dict):
+    """A game's state with its engine fields in their typed form.
+
+    Still the persisted JSON layout (handlers, ``encode_state`` and the state
+    diff keep treating it as a dict), but ``from_json`` converts the fields
+    the engine reads on every call once, at the repository boundary: player
+    ids are ints, ``turn_idx``/``direction`` are ints, ``hands`` maps int uids
+    to ``Hand`` objects and ``kicked`` is keyed by int uid (``encode_state``
+    turns both back into the JSON string keys). ``GameService`` reads them
+    without the ``or`` defaults, ``int()``/``str()`` casts a plain dict
+    needs, and checks pending colour/UNO choices through ``PendingPhase``.
+    No per-instance ``__dict__``: a cached state costs exactly its dict.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, state: dict[str, Any] | None) -> "GameState":
+        """Typed copy of a decoded state dict (a ``GameState`` is returned as is)."""
+        if type(state) is cls:
+            return state
+        gs = cls(state or {})
+        if "players" in gs:
+            gs["players"] = [int(uid) for uid in gs["players"] or []]
+        if "turn_idx" in gs:
+            gs["turn_idx"] = int(gs["turn_idx"] or 0)
+        if "direction" in gs:
+            gs["direction"] = -1 if int(gs["direction"] or 1) < 0 else 1
+        gs["hands"] = {
+            int(uid): h if isinstance(h, Hand) else Hand(h or [])
+            for uid, h in (gs.get("hands") or {}).items()
+        }
+        gs["kicked"] = {int(uid): meta for uid, meta in (gs.get("kicked") or {}).items()}
+        return gs
+
+    # -------------------- typed fields --------------------
+
+    @property
+    def turn(self) -> tuple[list[int], int, int]:
+        """``(players, turn_idx, direction)`` in one read (the turn helpers' hot path)."""
+        return self.get("players") or [], self.get("turn_idx", 0), self.get("direction", 1)
+
+    @property
+    def top_id(self) -> int | None:
+        """Card id of the top card (``None`` before the first move)."""
+        top = self.get("top_card")
+        return face_id(top) if top else None
+
+    @property
+    def pending_phase(self) -> PendingPhase:
+        return _PHASES[
+            _open(self.get("pending_color")) | _open(self.get("uno_pending")) << 1
+        ]
+
+    def pending(self, phase: PendingPhase) -> dict[str, Any] | None:
+        """The open record of ``phase`` (``None`` when it is not pending)."""
+        # state key holding each phase: {"active", "resolved", "player_id", ...}
+        record = self.get("pending_color" if phase is PendingPhase.COLOR else "uno_pending")
+        return record if _open(record) else None
+
+    def pending_uid(self, phase: PendingPhase) -> int | None:
+        """The player ``phase`` waits on."""
+        record = self.pending(phase)
+        return None if record is None else int(record.get("player_id", 0) or 0)
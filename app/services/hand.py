@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Iterable
+
+from app.services.card_codec import card_id
+from app.utils.card_catalog import CardCatalog
+
+# stand-in id for a card that is not in the deck (kept out of the id tables)
+UNKNOWN_ID = 255
+
+
+def group_key(card: dict[str, Any]) -> str:
+    """Dump group of a card: numbers by value, action cards by kind."""
+    kind = str(card.get("kind") or "").lower()
+    if kind == "num":
+        return f"num:{int(card.get('value') or 0)}"  # ✅ група по значенню
+    return kind
+
+
+def face_id(card: dict[str, Any]) -> int:
+    try:
+        return card_id(card)
+    except ValueError:
+        return UNKNOWN_ID
+
+
+class Hand(list):
+    """A player's cards (plain card dicts, JSON as before) with multiset indexes.
+
+    The sticker key, dump group and card id (``ids``, one byte per card) of
+    every position are kept in parallel, with a count per key and per group. Membership, group sizes and
+    dump eligibility are dict lookups; a position is found by a C-level scan
+    of the key list instead of rebuilding a key for every card. The mutators
+    used by the engine keep the indexes in sync; anything else re-indexes.
+    """
+
+    __slots__ = ("_keys", "_groups", "ids", "key_counts", "group_counts")
+
+    def __init__(self, cards: Iterable[dict[str, Any]] = ()) -> None:
+        super().__init__(cards)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._keys = [CardCatalog.card_key(c) for c in self]
+        self._groups = [group_key(c) for c in self]
+        self.ids = bytearray(face_id(c) for c in self)
+        self.key_counts = Counter(self._keys)
+        self.group_counts = Counter(self._groups)
+
+    def _added(self, card: dict[str, Any]) -> None:
+        k, g = CardCatalog.card_key(card), group_key(card)
+        self._keys.append(k)
+        self._groups.append(g)
+        self.ids.append(face_id(card))
+        self.key_counts[k] += 1
+        self.group_counts[g] += 1
+
+    def _dropped(self, k: str, g: str) -> None:
+        self.key_counts[k] -= 1
+        if not self.key_counts[k]:
+            del self.key_counts[k]
+        self.group_counts[g] -= 1
+        if not self.group_counts[g]:
+            del self.group_counts[g]
+
+    # -------------------- mutators --------------------
+
+    def append(self, card: dict[str, Any]) -> None:
+        super().append(card)
+        self._added(card)
+
+    def extend(self, cards: Iterable[dict[str, Any]]) -> None:
+        for card in cards:
+            self.append(card)
+
+    def pop(self, index: int = -1) -> dict[str, Any]:
+        card = super().pop(index)
+        del self.ids[index]
+        self._dropped(self._keys.pop(index), self._groups.pop(index))
+        return card
+
+    def clear(self) -> None:
+        super().clear()
+        self._reindex()
+
+    def take_group(self, group: str) -> list[dict[str, Any]]:
+        """Remove and return every card of ``group``, in hand order."""
+        if not self.group_counts.get(group):
+            return []
+        taken = [c for c, g in zip(self, self._groups) if g == group]
+        kept = [c for c, g in zip(self, self._groups) if g != group]
+        super().clear()
+        super().extend(kept)
+        self._reindex()
+        return taken
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+    def _mutated(name: str):
+        def method(self, *args, **kwargs):
+            result = getattr(list, name)(self, *args, **kwargs)
+            self._reindex()
+            return result
+
+        method.__name__ = name
+        return method
+
+    insert = _mutated("insert")
+    remove = _mutated("remove")
+    sort = _mutated("sort")
+    reverse = _mutated("reverse")
+    __setitem__ = _mutated("__setitem__")
+    __delitem__ = _mutated("__delitem__")
+    del _mutated
+
+    # -------------------- lookups --------------------
+
+    def find(self, key: str) -> int | None:
+        """Position of a card with sticker key ``key``."""
+        if not self.key_counts.get(key):
+            return None
+        return self._keys.index(key)
+
+    def groups(self) -> dict[str, int]:
+        """Card count per dump group, in order of first appearance in the hand."""
+        return {g: self.group_counts[g] for g in dict.fromkeys(self._groups)}
+
+    def group_index(self, group: str) -> int | None:
+        """Position of the first card of ``group``."""
+        if not self.group_counts.get(group):
+            return None
+        return self._groups.index(group)
+
+    def first_of_group(self, group: str) -> dict[str, Any] | None:
+        i = self.group_index(group)
+        return None if i is None else self[i]
+
+    def __reduce__(self):
+        # pickles/copies as a Hand rebuilt from its cards
+        return (Hand, (list(self),))
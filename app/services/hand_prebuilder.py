@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from pathlib import Path
+
+from config import Settings
+from app.utils import metrics
+from app.utils.card_catalog import CardCatalog
+from app.utils.card_file_cache import load_cache
+from app.utils.inline_hand_results import build_hand_results, has_dump_articles
+from app.services.card_codec import decode_state
+from app.services.game_state import GameState
+from app.services.game_service import GameService
+from app.services import state_diff
+from app.services.inline_hand_cache import inline_hand_cache
+
+logger = logging.getLogger("hand_prebuilder")
+
+
+class HandPrebuilder:
+    """Fills ``inline_hand_cache`` for a game's new version right after it is saved.
+
+    ``GameRepo.save`` hands over the committed (compact) state and the players
+    whose hand changed (``GameService.pop_hand_changes``). One background
+    thread rebuilds the results of those players and of the player to move,
+    and carries every other player's sticker-only entry over to the new
+    version, so opening "Мої карти" is a cache lookup.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._svc = GameService()
+        self._catalog: CardCatalog | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(Settings, "INLINE_PREBUILD", False))
+
+    def submit(
+        self, chat_id: int, game_id: int, version: int, encoded: dict, changed: list[int]
+    ) -> None:
+        """``encoded`` must not be mutated afterwards; it is copied on the worker."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="hand-prebuilder", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put((int(chat_id), int(game_id), int(version), encoded, changed))
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self.build(*job)
+            except Exception:
+                logger.exception("Prebuild for chat %s failed", job[0])
+
+    def build(
+        self, chat_id: int, game_id: int, version: int, encoded: dict, changed: list[int]
+    ) -> None:
+        state = GameState.from_json(decode_state(state_diff.copy_state(encoded)))
+        if str(state.get("status") or "").lower() != "playing":
+            return
+        if self._catalog is None:
+            self._catalog = CardCatalog(Path("app/assets"))
+
+        svc = self._svc
+        rebuild = set(changed)
+        try:
+            rebuild.add(int(svc.current_player_id(state)))
+        except Exception:
+            pass
+
+        stickers = load_cache()
+        for uid in svc.active_players(state):
+            if not svc.hand_size(state, uid):
+                continue
+            if uid in rebuild:
+                results = build_hand_results(
+                    state, chat_id, game_id, uid, svc, self._catalog, stickers
+                )
+                inline_hand_cache.put(chat_id, uid, game_id, version, results)
+                metrics.inc("inline_prebuilt")
+                continue
+            # same hand, not their turn: the previous version's stickers still apply
+            entry = inline_hand_cache.peek(chat_id, uid)
+            if (
+                entry is not None
+                and entry[:2] == (game_id, version - 1)
+                and not has_dump_articles(entry[2])
+            ):
+                inline_hand_cache.put(chat_id, uid, game_id, version, entry[2])
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+
+hand_prebuilder = HandPrebuilder()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from config import Settings
+from app.utils import metrics
+
+
+class InlineHandCache:
+    """Built "Мої карти" inline results per (chat, user), valid for one game version.
+
+    ``GameRepo`` reports every committed save through ``note_version``, so a
+    lookup can tell whether an entry is current without reading the game. An
+    entry built for an older version (or an earlier game in the chat) is a
+    miss. Entries are evicted least recently used beyond ``capacity``.
+    """
+
+    def __init__(self, capacity: int | None = None) -> None:
+        self.capacity = int(
+            capacity if capacity is not None else getattr(Settings, "INLINE_CACHE_SIZE", 5000)
+        )
+        self._lock = threading.Lock()
+        # chat_id -> (game_id, version) of the latest committed save
+        self._versions: dict[int, tuple[int, int]] = {}
+        # (chat_id, user_id) -> (game_id, version, results)
+        self._entries: OrderedDict[tuple[int, int], tuple[int, int, list[Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def note_version(self, chat_id: int, game_id: int, version: int) -> None:
+        current = (int(game_id), int(version))
+        with self._lock:
+            known = self._versions.get(int(chat_id))
+            # readers report what they loaded too; never go back in time
+            if known is None or current > known:
+                self._versions[int(chat_id)] = current
+
+    def forget(self, chat_id: int) -> None:
+        with self._lock:
+            self._versions.pop(int(chat_id), None)
+
+    def get(self, chat_id: int, user_id: int) -> list[Any] | None:
+        key = (int(chat_id), int(user_id))
+        with self._lock:
+            current = self._versions.get(key[0])
+            entry = self._entries.get(key)
+            if current is None or entry is None or entry[:2] != current:
+                self.misses += 1
+                hit = None
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hit = entry[2]
+        metrics.inc("inline_cache_hits" if hit is not None else "inline_cache_misses")
+        return hit
+
+    def peek(self, chat_id: int, user_id: int) -> tuple[int, int, list[Any]] | None:
+        """``(game_id, version, results)`` without touching LRU order or stats."""
+        with self._lock:
+            return self._entries.get((int(chat_id), int(user_id)))
+
+    def put(self, chat_id: int, user_id: int, game_id: int, version: int, results: list[Any]) -> None:
+        key = (int(chat_id), int(user_id))
+        with self._lock:
+            self._entries[key] = (int(game_id), int(version), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    @property
+    def hit_ratio(self) -> float:
+        with self._lock:
+            total = self.hits + self.misses
+            return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+inline_hand_cache = InlineHandCache()
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Iterable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.models import User, UserGroup
+
+METRICS = ("coins", "xp")
+# staged changes live here until the session commits
+_STAGE_KEY = "leaderboard_pending"
+
+
+class _Board:
+    """Best ``capacity`` players of one scope for one metric.
+
+    Invariant: a player that is not tracked has a value <= the lowest tracked
+    one, unless ``complete`` (every player of the scope is tracked).
+    """
+
+    __slots__ = ("values", "names", "complete", "stale", "_ranking", "_html")
+
+    def __init__(self, rows: Iterable[tuple[int, str, int]], capacity: int) -> None:
+        rows = list(rows)
+        self.values = {int(tg): int(v) for tg, _, v in rows}
+        self.names = {int(tg): name for tg, name, _ in rows}
+        self.complete = len(rows) < capacity
+        # too few tracked players left to fill the top; reload before next read
+        self.stale = False
+        self._ranking: list[int] | None = None
+        self._html: tuple[tuple, str] | None = None
+
+    def ranking(self) -> list[int]:
+        if self._ranking is None:
+            self._ranking = sorted(self.values, key=lambda u: (-self.values[u], u))
+        return self._ranking
+
+    def offer(self, tg: int, name: str, value: int, capacity: int, top_k: int) -> None:
+        values = self.values
+        if tg in values:
+            if values[tg] == value:
+                self.names[tg] = name
+                return
+            others = [v for u, v in values.items() if u != tg]
+            if not self.complete and others and value < min(others):
+                # may now rank below untracked players: stop tracking
+                del values[tg]
+                self.names.pop(tg, None)
+                self.stale = len(values) < top_k
+            else:
+                values[tg] = value
+        elif self.complete or (values and value > min(values.values())):
+            values[tg] = value
+            self.names[tg] = name
+            if len(values) > capacity:
+                last = min(values, key=lambda u: (values[u], -u))
+                del values[last]
+                self.names.pop(last, None)
+                self.complete = False
+        else:
+            return
+        self._ranking = None
+
+    def top(self, top_k: int) -> list[tuple[str, int]]:
+        return [(self.names[u], self.values[u]) for u in self.ranking()[:top_k]]
+
+    def html(self, top_k: int, render: Callable[[list[tuple[str, int]]], str]) -> str:
+        entries = self.top(top_k)
+        key = tuple(entries)
+        if self._html is None or self._html[0] != key:
+            self._html = (key, render(entries))
+        return self._html[1]
+
+
+class LeaderboardService:
+    """In-memory top lists per (group chat | global, metric).
+
+    Loaded once at startup (``load``); reward settlement and new group
+    memberships feed changes in through ``stage``, which only take effect when
+    the DB transaction commits. Reads never hit the DB except to reload a
+    board that lost too many tracked players.
+    """
+
+    def __init__(self, top_k: int = 10, capacity: int = 50) -> None:
+        self.top_k = int(top_k)
+        self.capacity = max(int(capacity), self.top_k)
+        self._lock = threading.Lock()
+        # (chat_id or None, metric) -> board
+        self._boards: dict[tuple[int | None, str], _Board] = {}
+        self._loaded = False
+
+    # -------------------- loading --------------------
+
+    def load(self) -> None:
+        from app.utils.db_manager import get_session
+
+        with get_session(readonly=True) as s:
+            boards = self._query_all(s)
+        with self._lock:
+            self._boards = boards
+            self._loaded = True
+
+    def _query_all(self, s: Session) -> dict[tuple[int | None, str], _Board]:
+        boards: dict[tuple[int | None, str], _Board] = {}
+        for metric in METRICS:
+            col = getattr(User, metric)
+            boards[(None, metric)] = _Board(
+                s.execute(
+                    select(User.tg_id, User.name, col)
+                    .order_by(col.desc(), User.tg_id)
+                    .limit(self.capacity)
+                ).all(),
+                self.capacity,
+            )
+
+            rn = (
+                func.row_number()
+                .over(partition_by=UserGroup.chat_id, order_by=(col.desc(), User.tg_id))
+                .label("rn")
+            )
+            ranked = (
+                select(UserGroup.chat_id, User.tg_id, User.name, col.label("value"), rn)
+                .join(User, User.tg_id == UserGroup.user_id)
+                .subquery()
+            )
+            by_chat: dict[int, list[tuple[int, str, int]]] = {}
+            for chat_id, tg, name, value, _ in s.execute(
+                select(ranked).where(ranked.c.rn <= self.capacity)
+            ):
+                by_chat.setdefault(int(chat_id), []).append((tg, name, value))
+            for chat_id, rows in by_chat.items():
+                boards[(chat_id, metric)] = _Board(rows, self.capacity)
+        return boards
+
+    def _query_one(self, chat_id: int | None, metric: str) -> _Board:
+        from app.utils.db_manager import get_session
+
+        col = getattr(User, metric)
+        stmt = (
+            select(User.tg_id, User.name, col)
+            .order_by(col.desc(), User.tg_id)
+            .limit(self.capacity)
+        )
+        if chat_id is not None:
+            stmt = stmt.join(UserGroup, UserGroup.user_id == User.tg_id).where(
+                UserGroup.chat_id == chat_id
+            )
+        with get_session(readonly=True) as s:
+            return _Board(s.execute(stmt).all(), self.capacity)
+
+    def _board(self, chat_id: int | None, metric: str) -> _Board:
+        key = (chat_id, metric)
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None and not board.stale:
+                return board
+            if board is None and self._loaded:
+                # group without members at load time; fed by stage() since
+                board = self._boards[key] = _Board([], self.capacity)
+                return board
+
+        board = self._query_one(chat_id, metric)
+        with self._lock:
+            self._boards[key] = board
+        return board
+
+    # -------------------- reads --------------------
+
+    def top(self, metric: str, chat_id: int | None = None) -> list[tuple[str, int]]:
+        board = self._board(chat_id, metric)
+        with self._lock:
+            return board.top(self.top_k)
+
+    def render(
+        self,
+        metric: str,
+        chat_id: int | None,
+        render: Callable[[list[tuple[str, int]]], str],
+    ) -> str | None:
+        """Cached ``render(entries)`` of the top list; None if it is empty."""
+        board = self._board(chat_id, metric)
+        with self._lock:
+            if not board.values:
+                return None
+            return board.html(self.top_k, render)
+
+    # -------------------- updates --------------------
+
+    def stage(
+        self,
+        session: Session,
+        rows: Iterable[tuple[int, str, dict[str, int], Iterable[int]]],
+    ) -> None:
+        """Queue ``(tg_id, name, {metric: value}, group chat ids)`` updates.
+
+        Applied on ``session`` commit, dropped on rollback.
+        """
+        session.info.setdefault(_STAGE_KEY, []).extend(rows)
+
+    def apply(self, rows: Iterable[tuple[int, str, dict[str, int], Iterable[int]]]) -> None:
+        with self._lock:
+            for tg, name, values, chat_ids in rows:
+                scopes = [None, *chat_ids]
+                for metric, value in values.items():
+                    for chat_id in scopes:
+                        board = self._boards.get((chat_id, metric))
+                        if board is None:
+                            if not self._loaded:
+                                # never read yet; loaded from the DB when it is
+                                continue
+                            board = self._boards[(chat_id, metric)] = _Board(
+                                [], self.capacity
+                            )
+                        board.offer(int(tg), name, int(value), self.capacity, self.top_k)
+
+    @property
+    def active(self) -> bool:
+        """False until something was loaded; updates are pointless before that."""
+        with self._lock:
+            return self._loaded or bool(self._boards)
+
+    def member_chats(self, session: Session, user_ids: list[int]) -> dict[int, list[int]]:
+        """Group chats of each player, for ``stage``; empty if nothing is cached."""
+        if not self.active:
+            return {}
+        chats: dict[int, list[int]] = {}
+        for uid, chat_id in session.execute(
+            select(UserGroup.user_id, UserGroup.chat_id).where(
+                UserGroup.user_id.in_(user_ids)
+            )
+        ):
+            chats.setdefault(int(uid), []).append(int(chat_id))
+        return chats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._boards.clear()
+            self._loaded = False
+
+
+leaderboard = LeaderboardService()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_staged(session: Session) -> None:
+    rows = session.info.pop(_STAGE_KEY, None)
+    if rows:
+        leaderboard.apply(rows)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_staged(session: Session, _previous_transaction) -> None:
+    session.info.pop(_STAGE_KEY, None)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.domain.entities.card import CardColor
+from app.services.card_codec import CARDS, DECK_SIZE
+from app.services.game_service import GameService
+from app.services.game_state import GameState
+from app.services.hand import UNKNOWN_ID, Hand
+
+# top card id used when there is no top card yet
+NO_TOP = DECK_SIZE
+# colour index 0 is "no / unknown colour" (can_play then ignores the colour)
+_COLOR_INDEX: dict[str, int] = {c.value: i for i, c in enumerate(CardColor, start=1)}
+N_COLORS = len(_COLOR_INDEX) + 1
+
+_NO, _YES = ord("0"), ord("1")
+
+
+def _build_rows() -> list[bytes]:
+    """One 256-byte row per (top id, colour): ``row[card id]`` is b"1" when playable.
+
+    Rows are ``bytes.translate`` tables, so a whole hand of card ids maps to
+    its playability string in one C call. Every cell is ``GameService.can_play``
+    evaluated once; ids without a card (and ``UNKNOWN_ID``) are b"0".
+    """
+    colors: list[str | None] = [None] * N_COLORS
+    for name, i in _COLOR_INDEX.items():
+        colors[i] = name
+    tops: list[dict[str, Any] | None] = list(CARDS) + [None]
+
+    rows: list[bytes] = []
+    for top in tops:
+        for color in colors:
+            row = bytearray([_NO]) * 256
+            for cid, card in enumerate(CARDS):
+                if GameService.can_play(card, top, color):
+                    row[cid] = _YES
+            rows.append(bytes(row))
+    return rows
+
+
+_ROWS = _build_rows()
+
+
+def top_index(state: GameState) -> int:
+    top_id = state.top_id
+    return NO_TOP if top_id is None else top_id
+
+
+def color_index(color: str | None) -> int:
+    return _COLOR_INDEX.get(color, 0) if color else 0
+
+
+def _row(state: GameState) -> bytes | None:
+    tid = top_index(state)
+    if tid == UNKNOWN_ID:
+        return None
+    return _ROWS[tid * N_COLORS + color_index(state.get("current_color"))]
+
+
+def playable(cid: int, top_id: int, color: int) -> bool:
+    """Table form of ``can_play`` on ids (``top_index``/``color_index``)."""
+    return _ROWS[top_id * N_COLORS + color][cid] == _YES
+
+
+def playable_mask(hand: Hand, state: GameState) -> int:
+    """Bit ``i`` set when ``hand[i]`` can be played on the state's top card/colour."""
+    if not hand:
+        return 0
+    row = _row(state)
+    if row is None or UNKNOWN_ID in hand.ids:
+        # a card outside the deck: ask the rule itself
+        top, current_color = state.get("top_card"), state.get("current_color")
+        return sum(
+            1 << i
+            for i, card in enumerate(hand)
+            if GameService.can_play(card, top, current_color)
+        )
+    return int(hand.ids.translate(row)[::-1], 2)
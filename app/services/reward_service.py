@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from bisect import bisect_right
+from functools import lru_cache
 from math import ceil
 from random import randint
 from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.models import User
+from app.services.leaderboard_service import leaderboard
 
 
 def _rand_range(rng: tuple[int, int]) -> int:
@@ -32,8 +35,32 @@ def apply_rewards(
 ) -> tuple[dict[int, dict], dict[int, dict]]:
     level_ups: dict[int, dict] = {}
     rewards: dict[int, dict] = {}
-    for idx, uid in enumerate(placements):
-        uid = int(uid)
+    uids = list(dict.fromkeys(int(uid) for uid in placements))
+    if not uids:
+        return level_ups, rewards
+
+    # one round trip in, one executemany out
+    rows = session.execute(
+        select(
+            User.id,
+            User.tg_id,
+            User.name,
+            User.coins,
+            User.xp,
+            User.wins,
+            User.games_played,
+            User.level,
+            User.next_level_experience,
+        )
+        .where(User.tg_id.in_(uids))
+        .with_for_update()
+    ).all()
+    by_tg = {int(r.tg_id): r for r in rows}
+
+    updates: list[dict] = []
+    board_rows: list[tuple] = []
+    chats = leaderboard.member_chats(session, list(by_tg))
+    for idx, uid in enumerate(uids):
         if idx == 0:
             coins = _rand_range(top1)
             xp = _rand_range(top1_xp)
@@ -47,33 +74,68 @@ def apply_rewards(
             coins = _rand_range(min_reward)
             xp = _rand_range(min_xp)
 
-        user = session.scalar(select(User).where(User.tg_id == uid))
-        if not user:
+        row = by_tg.get(uid)
+        if row is None:
             continue
 
-        user.coins += int(coins)
-        user.xp += int(xp)
         rewards[uid] = {"coins": int(coins), "xp": int(xp)}
-        if idx == 0:
-            user.wins += 1
-        gained, new_level = _apply_level_up(user)
+        gained, level, left_xp, next_req = _level_up(
+            int(row.level), int(row.xp) + int(xp), int(row.next_level_experience)
+        )
         if gained > 0:
-            level_ups[uid] = {"gained": int(gained), "level": int(new_level)}
+            level_ups[uid] = {"gained": int(gained), "level": int(level)}
+        updates.append(
+            {
+                "id": row.id,
+                "coins": int(row.coins) + int(coins),
+                "xp": left_xp,
+                "wins": int(row.wins) + (1 if idx == 0 else 0),
+                "games_played": int(row.games_played) + 1,
+                "level": level,
+                "next_level_experience": next_req,
+            }
+        )
+        board_rows.append(
+            (
+                uid,
+                row.name,
+                {"coins": updates[-1]["coins"], "xp": left_xp},
+                chats.get(uid, ()),
+            )
+        )
+
+    if updates:
+        # ORM bulk UPDATE by primary key
+        session.execute(update(User), updates)
+        leaderboard.stage(session, board_rows)
     return level_ups, rewards
 
 
-def _apply_level_up(user: User) -> tuple[int, int]:
-    gained = 0
-    # Level up while XP threshold is reached; grow threshold by 1.2x each level.
-    while int(user.xp) >= int(user.next_level_experience):
-        user.xp -= int(user.next_level_experience)
-        user.level += 1
-        gained += 1
-        next_req = int(ceil(float(user.next_level_experience) * 1.2))
-        if next_req <= int(user.next_level_experience):
-            next_req = int(user.next_level_experience) + 1
-        user.next_level_experience = next_req
-    return gained, int(user.level)
+# XP needed for the next level grows 1.2x per level (at least +1).
+_XP_CAP = 2**31 - 1
+
+
+@lru_cache(maxsize=256)
+def _level_table(start: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Thresholds from ``start`` on, and the XP needed to clear the first i."""
+    thresholds = [int(start)]
+    totals = [0]
+    while totals[-1] <= _XP_CAP:
+        cur = thresholds[-1]
+        totals.append(totals[-1] + cur)
+        nxt = int(ceil(float(cur) * 1.2))
+        thresholds.append(nxt if nxt > cur else cur + 1)
+    return tuple(thresholds), tuple(totals)
+
+
+def _level_up(level: int, xp: int, next_req: int) -> tuple[int, int, int, int]:
+    """Returns (gained, level, xp left, next threshold) for a new XP total."""
+    if next_req <= 0:
+        # degenerate row; the table needs a positive start
+        next_req = 1
+    thresholds, totals = _level_table(next_req)
+    gained = bisect_right(totals, xp) - 1
+    return gained, level + gained, xp - totals[gained], thresholds[gained]
 
 
 def apply_rewards_if_needed(session: Session, state: dict, settings) -> dict[int, dict]:
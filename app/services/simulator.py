@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import random
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from app.services.game_service import GameService
+from app.services.game_state import GameState, PendingPhase
+from app.services.hand import Hand
+from app.services.playability import playable_mask
+
+COLORS = ("red", "green", "blue", "yellow")
+
+# what a policy may answer on its turn
+PLAY, DUMP, DRAW, WAIT = "play", "dump", "draw", "wait"
+
+Action = tuple[str, Any]
+Policy = Callable[[Hand, int, bool, random.Random], Action]
+
+
+def _dump_groups(hand: Hand, mask: int) -> list[str]:
+    """Dump groups (2+ cards) whose first card is playable now."""
+    return [
+        g
+        for g, n in hand.groups().items()
+        if n >= 2 and mask >> hand.group_index(g) & 1
+    ]
+
+
+def _indices(mask: int) -> list[int]:
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+def first_policy(hand: Hand, mask: int, drew: bool, rnd: random.Random) -> Action:
+    """Play the first playable card, else draw once, else let the turn time out."""
+    if mask:
+        return PLAY, (mask & -mask).bit_length() - 1
+    return (WAIT, None) if drew else (DRAW, None)
+
+
+def random_policy(hand: Hand, mask: int, drew: bool, rnd: random.Random) -> Action:
+    """Any legal move (dumps included) with equal chance."""
+    moves: list[Action] = [(PLAY, i) for i in _indices(mask)]
+    moves += [(DUMP, g) for g in _dump_groups(hand, mask)]
+    if moves:
+        return rnd.choice(moves)
+    return (WAIT, None) if drew else (DRAW, None)
+
+
+def greedy_policy(hand: Hand, mask: int, drew: bool, rnd: random.Random) -> Action:
+    """Biggest dump first, then action cards, numbers, and wilds last."""
+    groups = _dump_groups(hand, mask)
+    if groups:
+        return DUMP, max(groups, key=lambda g: hand.group_counts[g])
+    if mask:
+        rank = {"p2": 0, "skip": 1, "rev": 2, "num": 3, "wild": 4, "p4": 5}
+        return PLAY, min(_indices(mask), key=lambda i: rank.get(hand[i].get("kind"), 3))
+    return (WAIT, None) if drew else (DRAW, None)
+
+
+POLICIES: dict[str, Policy] = {
+    "first": first_policy,
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def pick_color(hand: Hand, rnd: random.Random) -> str:
+    """The colour the hand holds most of (random on an empty/all-wild hand)."""
+    counts = Counter(c.get("color") for c in hand if c.get("color") in COLORS)
+    return counts.most_common(1)[0][0] if counts else rnd.choice(COLORS)
+
+
+@dataclass(slots=True)
+class SimResult:
+    """Totals of one or more simulated games; ``merge`` adds another result in."""
+
+    games: int = 0
+    finished: int = 0
+    capped: int = 0
+    moves: int = 0
+    kicks: int = 0
+    deck_exhausted: int = 0  # games that emptied the draw pile
+    rejected: int = 0  # engine calls the policy expected to succeed but did not
+    # engine call -> latencies in ns
+    ops: dict[str, array] = field(default_factory=dict)
+
+    def merge(self, other: "SimResult") -> None:
+        self.games += other.games
+        self.finished += other.finished
+        self.capped += other.capped
+        self.moves += other.moves
+        self.kicks += other.kicks
+        self.deck_exhausted += other.deck_exhausted
+        self.rejected += other.rejected
+        for op, samples in other.ops.items():
+            self.ops.setdefault(op, array("q")).extend(samples)
+
+
+class Simulator:
+    """Plays whole games against ``GameService`` with no bot, database or timers.
+
+    Seats take ``policies`` in turn. A turn goes the way the handlers drive it:
+    skip penalties are consumed first (``prepare_turn_timer``), the player
+    plays, dumps or draws; after drawing they may play or draw again, and a
+    player who waits is charged the turn-timeout penalty. A player left with
+    one card forgets "UNO" with probability ``uno_miss`` and takes the UNO
+    penalty. Seeded decks are never reshuffled, so a game that runs out of
+    cards and moves stops at ``max_moves`` and is counted as capped.
+    """
+
+    def __init__(
+        self,
+        players: int = 4,
+        policies: Sequence[str] = ("greedy",),
+        *,
+        max_draws: int = 1,
+        uno_miss: float = 0.1,
+        max_moves: int = 1000,
+    ) -> None:
+        self.players = int(players)
+        self.policies = [POLICIES[p] for p in policies]
+        self.max_draws = int(max_draws)
+        self.uno_miss = float(uno_miss)
+        self.max_moves = int(max_moves)
+        self.svc = GameService()
+
+    def _call(self, res: SimResult, op: str, fn: Callable, *args, **kwargs):
+        t0 = time.perf_counter_ns()
+        out = fn(*args, **kwargs)
+        samples = res.ops.get(op)
+        if samples is None:
+            samples = res.ops[op] = array("q")
+        samples.append(time.perf_counter_ns() - t0)
+        return out
+
+    def play(self, seed: int, res: SimResult | None = None) -> SimResult:
+        res = res if res is not None else SimResult()
+        svc = self.svc
+        rnd = random.Random(seed)
+        uids = list(range(1, self.players + 1))
+        seat = {uid: self.policies[i % len(self.policies)] for i, uid in enumerate(uids)}
+
+        state = self._call(res, "start_game_state", svc.start_game_state, uids, seed=seed)
+        moves = 0
+        while state.get("status") != "finished" and moves < self.max_moves:
+            while self._call(res, "consume_skip", svc.consume_skip_if_marked, state):
+                pass
+            if state.get("status") == "finished":
+                break
+            uid = int(svc.current_player_id(state))
+            draws = 0
+            while True:
+                moves += 1
+                hand = svc.hand_of(state, uid)
+                mask = self._call(res, "playable_mask", playable_mask, hand, state)
+                action, arg = seat[uid](hand, mask, draws >= self.max_draws, rnd)
+                if action == DRAW:
+                    draws += 1
+                    ok, code = self._call(res, "draw_card_and_pass", svc.draw_card_and_pass, state, uid)
+                    if ok and code == "KICKED":
+                        break  # the engine already passed the turn on
+                    if ok:
+                        continue  # still their turn: play the new card or wait
+                    res.rejected += 1
+                    action = WAIT
+                if action == WAIT:
+                    self._call(
+                        res, "turn_timeout", svc.apply_penalty_and_skip_if_possible,
+                        state, uid, reason="TURN_TIMEOUT", cards=2,
+                    )
+                    break
+                if action == DUMP:
+                    ok, code = self._call(res, "play_group_dump", svc.play_group_dump, state, uid, arg)
+                else:
+                    ok, code = self._call(res, "play_card", svc.play_card, state, uid, arg)
+                if not ok:
+                    res.rejected += 1
+                    self._call(
+                        res, "turn_timeout", svc.apply_penalty_and_skip_if_possible,
+                        state, uid, reason="TURN_TIMEOUT", cards=2,
+                    )
+                    break
+                if code == "PENDING_COLOR":
+                    ok, _ = self._call(
+                        res, "choose_color", svc.choose_color,
+                        state, uid, pick_color(svc.hand_of(state, uid), rnd),
+                    )
+                    if not ok:
+                        res.rejected += 1
+                self._uno(res, state, uid, rnd)
+                break
+            res.kicks += len(svc.pop_kick_events(state))
+            svc.pop_hand_changes(state)
+
+        res.games += 1
+        res.moves += moves
+        if svc.deck_size(state) == 0:
+            res.deck_exhausted += 1
+        if state.get("status") == "finished":
+            res.finished += 1
+        else:
+            res.capped += 1
+        return res
+
+    def _uno(self, res: SimResult, state: GameState, uid: int, rnd: random.Random) -> None:
+        """Resolve the "UNO" call of a player left with one card."""
+        if state.pending_uid(PendingPhase.UNO) != uid:
+            return
+        if rnd.random() < self.uno_miss:
+            self._call(
+                res, "uno_timeout", self.svc.apply_penalty_and_skip_if_possible,
+                state, uid, reason="UNO_TIMEOUT", cards=2,
+            )
+        self.svc.clear_uno_for_uid(state, uid)
+
+
+def run_games(
+    seeds: Sequence[int],
+    players: int = 4,
+    policies: Sequence[str] = ("greedy",),
+    **options: Any,
+) -> SimResult:
+    """Play one game per seed (a picklable entry point for process pools)."""
+    sim = Simulator(players, policies, **options)
+    res = SimResult()
+    for seed in seeds:
+        sim.play(seed, res)
+    return res
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+# A diff is a list of small ops, each a JSON list:
+#   ["s", path, value]  set path to value
+#   ["d", path]         delete dict key at path
+#   ["a", path, items]  append items to the list at path
+#   ["t", path, n]      truncate the list at path to n items
+# path is a list of dict keys leading to the target.
+
+
+def copy_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Deep copy of a JSON-compatible state (faster than copy.deepcopy)."""
+    return json.loads(json.dumps(state))
+
+
+def diff(old: Any, new: Any, path: list[str] | None = None) -> list[list]:
+    path = path or []
+    ops: list[list] = []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k, v in new.items():
+            if k not in old:
+                ops.append(["s", path + [k], v])
+            elif old[k] != v:
+                ops.extend(diff(old[k], v, path + [k]))
+        for k in old:
+            if k not in new:
+                ops.append(["d", path + [k]])
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and path:
+        n_old, n_new = len(old), len(new)
+        if n_new > n_old and new[:n_old] == old:
+            return [["a", path, new[n_old:]]]
+        if n_new < n_old and old[:n_new] == new:
+            return [["t", path, n_new]]
+
+    if old != new:
+        ops.append(["s", path, new])
+    return ops
+
+
+def apply(state: dict[str, Any], ops: list[list]) -> dict[str, Any]:
+    """Apply ops produced by ``diff`` to ``state`` in place."""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            state.clear()
+            state.update(op[2])
+            continue
+
+        parent = state
+        for k in path[:-1]:
+            parent = parent.setdefault(k, {})
+        key = path[-1]
+
+        if kind == "s":
+            parent[key] = op[2]
+        elif kind == "d":
+            parent.pop(key, None)
+        elif kind == "a":
+            parent.setdefault(key, []).extend(op[2])
+        elif kind == "t":
+            del parent[key][op[2]:]
+        else:
+            raise ValueError(f"Unknown state op: {kind!r}")
+    return state
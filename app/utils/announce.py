@@ -1,4 +1,7 @@
+from config import Settings
 from app.utils.text_models import mention
+from app.workers.outbox import outbox
+from app.workers.live_table import live_table
 
 
 def podium_lines(state: dict) -> list[str]:
@@ -35,6 +38,69 @@ def podium_lines(state: dict) -> list[str]:
     return lines
 
 
+def _display(state: dict, x_uid: int) -> str:
+    m = (state.get("player_meta", {}) or {}).get(str(x_uid), {})
+    name = m.get("name") or (("@" + m["username"]) if m.get("username") else str(x_uid))
+    return mention(x_uid, name)
+
+
+def table_text(state: dict, svc, settings, played_uid: int | None = None) -> str:
+    """The live table: top card, colour, turn with its timer, cards per player."""
+    top = state.get("top_card") or {}
+    kind = str(top.get("kind") or "")
+    if kind == "num":
+        top_pretty = str(top.get("value"))
+    else:
+        top_pretty = settings.other_type_cards.get(kind, kind) or "-"
+    color_key = state.get("current_color") if kind in ("wild", "p4") else top.get("color")
+    color = settings.colors.get(color_key or "", color_key or "-")
+    finished = str(state.get("status") or "").lower() == "finished"
+
+    lines = [
+        "🏁 <b>Гру завершено</b>" if finished else "🎮 <b>Стіл</b>",
+        f"🃏 Верхня карта: {top_pretty}",
+        f"🎨 Поточний колір: <b>{color}</b>",
+    ]
+    if played_uid is not None:
+        lines.append(f"✅ Останній хід: {_display(state, played_uid)}")
+
+    cur_uid = None
+    if not finished:
+        try:
+            cur_uid = int(svc.current_player_id(state))
+        except Exception:
+            cur_uid = None
+    if cur_uid is not None:
+        turn = (state.get("timers") or {}).get("turn") or {}
+        timer = f" (⏳ {int(turn['seconds'])}с)" if turn.get("seconds") else ""
+        lines.append(f"➡️ Хід: {_display(state, cur_uid)}{timer}")
+
+    lines.append("")
+    for uid in svc.active_players(state):
+        mark = "▶️ " if uid == cur_uid else ""
+        lines.append(f"{mark}{_display(state, uid)} — {svc.hand_size(state, uid)} 🃏")
+    return "\n".join(lines)
+
+
+def refresh_table(kb, chat_id: int, state: dict, svc, settings, played_uid: int | None = None) -> bool:
+    """Show ``state`` on the game's table message (debounced edit).
+
+    Returns False if live table mode is off or the game has no table message;
+    callers then post their status message as before. A finished game gets its
+    final table right away, without the cards keyboard.
+    """
+    message_id = state.get("table_message_id")
+    if not getattr(Settings, "LIVE_TABLE", False) or not message_id:
+        return False
+    table_chat = int(state.get("table_chat_id") or chat_id)
+    text = table_text(state, svc, settings, played_uid)
+    if str(state.get("status") or "").lower() == "finished":
+        live_table.close(table_chat, message_id, text)
+    else:
+        live_table.update(table_chat, message_id, text, kb.game.get_cards_kb(chat_id))
+    return True
+
+
 def announce_after_move(
     bot, kb, chat_id: int, played_uid: int, state: dict, svc, settings
 ) -> None:
@@ -74,6 +140,8 @@ def announce_after_move(
     if kind == "num":
         kind = ""
 
+    live = refresh_table(kb, chat_id, state, svc, settings, played_uid)
+
     # finished => показуємо переможця і не даємо інлайн-кнопок гри
     if finished:
         text = [
@@ -81,7 +149,7 @@ def announce_after_move(
             "",
             f"Last card: {kind} {top_value} {top_color}",
         ]
-        bot.send_message(
+        outbox.send(
             chat_id,
             "\n".join(text),
             parse_mode="HTML",
@@ -89,6 +157,9 @@ def announce_after_move(
         )
         return
 
+    if live:
+        return
+
     text = [
         f"✅ Хід зробив: {display(played_uid)}",
         f"🃏 Верхня карта: {kind} {top_value} {top_color}\n",
@@ -97,7 +168,7 @@ def announce_after_move(
     if cur_uid:
         text.append(f"➡️ Далі хід: {display(cur_uid)}")
 
-    bot.send_message(
+    outbox.send(
         chat_id,
         "\n".join(text),
         parse_mode="HTML",
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from sqlalchemy.util.concurrency import await_only, greenlet_spawn
+
+
+class SyncBotBridge:
+    """TeleBot-shaped facade over an ``AsyncTeleBot``.
+
+    The handler classes register plain functions through the usual decorators
+    and call ``self.bot.send_message(...)`` synchronously. Here every handler
+    runs inside ``greenlet_spawn`` and every Bot API call is ``await_only``-ed,
+    so the same code suspends on the event loop instead of blocking a thread.
+    Only valid inside such a greenlet (handlers, chat actors).
+    """
+
+    def __init__(self, async_bot) -> None:
+        self.async_bot = async_bot
+
+    # -------------------- handler registration --------------------
+
+    def _register(self, kind: str, kwargs: dict) -> Callable:
+        def decorator(fn: Callable) -> Callable:
+            async def run(update: Any) -> None:
+                await greenlet_spawn(fn, update)
+
+            getattr(self.async_bot, kind)(**kwargs)(run)
+            return fn
+
+        return decorator
+
+    def message_handler(self, **kwargs) -> Callable:
+        return self._register("message_handler", kwargs)
+
+    def callback_query_handler(self, **kwargs) -> Callable:
+        return self._register("callback_query_handler", kwargs)
+
+    def inline_handler(self, **kwargs) -> Callable:
+        return self._register("inline_handler", kwargs)
+
+    def chosen_inline_handler(self, **kwargs) -> Callable:
+        return self._register("chosen_inline_handler", kwargs)
+
+    def my_chat_member_handler(self, **kwargs) -> Callable:
+        return self._register("my_chat_member_handler", kwargs)
+
+    # -------------------- Bot API --------------------
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.async_bot, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return await_only(attr(*args, **kwargs))
+
+        call.__name__ = name
+        return call
@@ -1,26 +1,96 @@
 from sqlalchemy import create_engine
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.util.concurrency import in_greenlet
 
 from config import settings
+from app.utils import storage_profiles
 
 
 class Base(DeclarativeBase): ...
 
 
-engine = create_engine(settings.DB_URL, future=True)
+engine = create_engine(
+    settings.DB_URL,
+    future=True,
+    **storage_profiles.engine_options(
+        settings.DB_URL, settings.DB_PROFILE, settings.DB_POOL_SIZE
+    ),
+)
+storage_profiles.configure(engine, settings.DB_URL, settings.DB_PROFILE)
+# same pool; read-only sessions skip the up-front write lock (sqlite-wal profile)
+read_engine = engine.execution_options(**{storage_profiles.BEGIN_OPTION: "DEFERRED"})
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
 )
 
+# asyncio runtime (AsyncTelegramBot); created by init_async_engine()
+async_engine = None
+AsyncSessionLocal = None
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in _ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for {scheme!r}")
+    return _ASYNC_DRIVERS[dialect] + sep + rest
+
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
 
 
+def init_async_engine():
+    """Create the async engine (needs aiosqlite/asyncpg and greenlet)."""
+    global async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        return async_engine
+
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    url = async_url(settings.DB_URL)
+    async_engine = create_async_engine(
+        url,
+        **storage_profiles.engine_options(
+            settings.DB_URL, settings.DB_PROFILE, settings.DB_POOL_SIZE
+        ),
+    )
+    storage_profiles.configure(async_engine.sync_engine, url, settings.DB_PROFILE)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    return async_engine
+
+
+async def async_init_db() -> None:
+    async with init_async_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def _new_session(readonly: bool = False):
+    # Code running inside greenlet_spawn() on the asyncio runtime gets the sync
+    # facade of an AsyncSession: same ORM API, non-blocking driver underneath.
+    if AsyncSessionLocal is not None and in_greenlet():
+        if readonly:
+            return AsyncSessionLocal(
+                bind=async_engine.execution_options(
+                    **{storage_profiles.BEGIN_OPTION: "DEFERRED"}
+                )
+            ).sync_session
+        return AsyncSessionLocal().sync_session
+    return SessionLocal(bind=read_engine) if readonly else SessionLocal()
+
+
 @contextmanager
-def get_session():
-    session = SessionLocal()
+def get_session(readonly: bool = False):
+    session = _new_session(readonly)
     try:
         yield session
         session.commit()
@@ -29,3 +99,18 @@ def get_session():
         raise
     finally:
         session.close()
+
+
+@asynccontextmanager
+async def get_async_session():
+    if AsyncSessionLocal is None:
+        init_async_engine()
+    session = AsyncSessionLocal()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
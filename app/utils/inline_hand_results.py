@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from telebot import types as tp
+
+from app.services.game_state import GameState, PendingPhase
+from app.services.playability import playable_mask
+
+
+def build_hand_results(
+    state: GameState,
+    chat_id: int,
+    game_id: int,
+    user_id: int,
+    svc,
+    card_catalog,
+    stickers: dict[str, str],
+) -> list:
+    """Inline results for "Мої карти": dump articles (own turn) + hand stickers.
+
+    Callers check first that ``user_id`` is an active player with cards.
+    """
+    hand = svc.hand_of(state, user_id)
+    results: list = []
+
+    # ------------------ DUMP ARTICLES (тільки коли твій хід і нема pending_color) ------------------
+    is_my_turn = int(svc.current_player_id(state)) == int(user_id)
+    if is_my_turn and PendingPhase.COLOR not in state.pending_phase:
+        # біт i: hand[i] можна зіграти ЗАРАЗ
+        mask = playable_mask(hand, state)
+
+        # робимо Article тільки для тих груп, де 2+ карт (групи як у play_group_dump)
+        for group, n in hand.groups().items():
+            if n < 2:
+                continue
+
+            # перевіряємо: перша карта цієї групи має бути зіграбельна ЗАРАЗ
+            if not mask >> hand.group_index(group) & 1:
+                continue
+
+            kb = tp.InlineKeyboardMarkup()
+            kb.add(
+                tp.InlineKeyboardButton(
+                    text=f"🗑 Скинути всі такі ({n})",
+                    callback_data=f"dump:{chat_id}:{user_id}:{group}",
+                )
+            )
+
+            results.append(
+                tp.InlineQueryResultArticle(
+                    id=f"dump:{game_id}:{user_id}:{group}",
+                    title=dump_title(group, n),
+                    description="Натисни, щоб зʼявилась кнопка скидання в чаті",
+                    input_message_content=tp.InputTextMessageContent(
+                        message_text=dump_text(group, n),
+                        parse_mode="HTML",
+                        disable_web_page_preview=True,
+                    ),
+                    reply_markup=kb,
+                )
+            )
+
+    # ------------------ STICKERS (твоя рука) ------------------
+    for idx, card in enumerate(hand):
+        file_id = stickers.get(card_catalog.card_key(card))
+        if not file_id:
+            continue
+
+        results.append(
+            tp.InlineQueryResultCachedSticker(
+                id=f"{game_id}:{user_id}:{idx}",
+                sticker_file_id=file_id,
+            )
+        )
+
+    return results
+
+
+def has_dump_articles(results: list) -> bool:
+    return any(isinstance(r, tp.InlineQueryResultArticle) for r in results)
+
+
+def dump_title(group: str, n: int) -> str:
+    # title в списку інлайн-результатів
+    return f"🗑 Скинути всі: {pretty_group(group)} ({n})"
+
+
+def dump_text(group: str, n: int) -> str:
+    # текст, який відправиться в чат при виборі Article
+    return (
+        f"🗑 <b>Скидання групи</b>\n"
+        f"Тип: <b>{pretty_group(group)}</b>\n"
+        f"К-сть: <b>{n}</b>\n\n"
+        f"Натисни кнопку нижче 👇"
+    )
+
+
+def pretty_group(group: str) -> str:
+    # group приходить з GameService.group_key()
+    # приклади: "num:5", "p2", "p4", "wild", "skip", "rev"
+    if group.startswith("num:"):
+        v = group.split(":", 1)[1]
+        return f"{v}"
+    if group == "p2":
+        return "+2"
+    if group == "p4":
+        return "+4"
+    if group == "wild":
+        return "WILD"
+    if group == "skip":
+        return "SKIP"
+    if group == "rev":
+        return "REV"
+    return group.upper()
@@ -1,4 +1,5 @@
 from app.utils.text_models import mention
+from app.workers.outbox import outbox, PRIORITY_INFO
 
 
 def send_level_up_notifications(bot, chat_id: int, level_ups: dict, meta: dict) -> None:
@@ -18,22 +19,24 @@ def send_level_up_notifications(bot, chat_id: int, level_ups: dict, meta: dict)
 
         # Group message
         try:
-            bot.send_message(
+            outbox.send(
                 chat_id,
                 f"Level up: {mention(uid, name)} +{gained} -> level {level}",
                 parse_mode="HTML",
                 disable_web_page_preview=True,
+                priority=PRIORITY_INFO,
             )
         except Exception:
             pass
 
         # Private message
         try:
-            bot.send_message(
+            outbox.send(
                 uid,
                 f"Level up! You reached level {level} (+{gained}).",
                 parse_mode="HTML",
                 disable_web_page_preview=True,
+                priority=PRIORITY_INFO,
             )
         except Exception:
             pass
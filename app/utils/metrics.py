@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger("metrics")
+
+_lock = threading.Lock()
+_counters: Counter[str] = Counter()
+_gauges: dict[str, float] = {}
+
+
+def inc(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] += n
+
+
+def set_max(name: str, value: float) -> None:
+    """Keep the highest value seen for a gauge (e.g. peak queue depth)."""
+    with _lock:
+        if value > _gauges.get(name, float("-inf")):
+            _gauges[name] = value
+
+
+def snapshot() -> dict[str, float]:
+    with _lock:
+        return {**_counters, **_gauges}
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+
+
+def log_snapshot() -> None:
+    data = snapshot()
+    if data:
+        logger.info(
+            "metrics: %s", ", ".join(f"{k}={v}" for k, v in sorted(data.items()))
+        )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Connection-level tuning applied by db_manager, selected with DB_PROFILE:
+#   "default"    plain create_engine(), nothing touched
+#   "sqlite-wal" WAL journal + pragmas below, pooled connections, BEGIN IMMEDIATE
+#   "auto"       "sqlite-wal" for file-backed SQLite URLs, otherwise "default"
+
+SQLITE_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    # fsync on checkpoint only; a crash may lose the last commits, never corrupt
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # KiB
+    "busy_timeout": 10_000,  # ms
+    "temp_store": "MEMORY",
+}
+
+# execution option read by the "begin" hook; readonly sessions set it to DEFERRED
+BEGIN_OPTION = "sqlite_begin"
+
+
+def resolve(url: str, profile: str) -> str:
+    profile = (profile or "auto").lower()
+    if profile != "auto":
+        return profile
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite" and u.database not in (None, "", ":memory:"):
+        return "sqlite-wal"
+    return "default"
+
+
+def engine_options(url: str, profile: str, pool_size: int = 16) -> dict:
+    """Extra ``create_engine`` kwargs for the profile."""
+    if resolve(url, profile) != "sqlite-wal":
+        return {}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": pool_size,
+        "pool_timeout": 30,
+        "connect_args": {"check_same_thread": False},
+    }
+
+
+def configure(engine, url: str, profile: str) -> str:
+    """Attach the profile's connect/begin hooks. Returns the resolved profile.
+
+    ``engine`` is a sync Engine; pass ``async_engine.sync_engine`` for asyncio.
+    """
+    profile = resolve(url, profile)
+    if profile != "sqlite-wal":
+        return profile
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record) -> None:
+        # let SQLAlchemy emit BEGIN itself instead of the driver's implicit one
+        dbapi_conn.isolation_level = None
+        cur = dbapi_conn.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS.items():
+                cur.execute(f"PRAGMA {name}={value}")
+        finally:
+            cur.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn) -> None:
+        # IMMEDIATE takes the write lock up front: writers queue on busy_timeout
+        # instead of failing with SQLITE_BUSY when a read transaction upgrades
+        mode = conn.get_execution_options().get(BEGIN_OPTION, "IMMEDIATE")
+        conn.exec_driver_sql(f"BEGIN {mode}")
+
+    return profile
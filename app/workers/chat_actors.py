@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Callable
+
+from config import Settings
+from app.utils import metrics
+
+logger = logging.getLogger("chat_actors")
+
+
+class ChatActorExecutor:
+    """Per-chat mailboxes drained by a shared worker pool.
+
+    Tasks for one chat run one at a time and in submission order; different
+    chats run in parallel. Game updates therefore never race each other on the
+    optimistic version check.
+    """
+
+    # tasks drained per turn before the chat yields its worker to other chats
+    BATCH = 16
+
+    def __init__(self, workers: int = 16) -> None:
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(workers)), thread_name_prefix="chat-actor"
+        )
+        self._lock = threading.Lock()
+        self._mailboxes: dict[int, deque] = {}
+
+    def submit(self, chat_id: int, fn: Callable, *args, **kwargs) -> None:
+        chat_id = int(chat_id)
+        with self._lock:
+            box = self._mailboxes.get(chat_id)
+            schedule = box is None
+            if schedule:
+                box = self._mailboxes[chat_id] = deque()
+            box.append((fn, args, kwargs))
+            depth = len(box)
+        metrics.inc("actor_tasks")
+        metrics.set_max("actor_mailbox_peak", depth)
+        if schedule:
+            self._pool.submit(self._drain, chat_id)
+
+    def _drain(self, chat_id: int) -> None:
+        while True:
+            for _ in range(self.BATCH):
+                with self._lock:
+                    box = self._mailboxes.get(chat_id)
+                    if not box:
+                        self._mailboxes.pop(chat_id, None)
+                        return
+                    fn, args, kwargs = box.popleft()
+                try:
+                    fn(*args, **kwargs)
+                except Exception:
+                    logger.exception("Task for chat %s failed", chat_id)
+
+            # busy chat: requeue so other chats get a worker too
+            try:
+                self._pool.submit(self._drain, chat_id)
+                return
+            except RuntimeError:
+                # pool is shutting down: finish the mailbox on this thread
+                continue
+
+    def pending(self) -> dict[int, int]:
+        with self._lock:
+            return {k: len(v) for k, v in self._mailboxes.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+class AsyncChatActors:
+    """``ChatActorExecutor`` for the asyncio runtime.
+
+    Mailboxes live on the event loop; each busy chat gets one drain task that
+    runs the (sync) handlers in greenlets, so their DB and Bot API calls await
+    the async drivers instead of blocking a thread. ``submit`` is thread-safe:
+    APScheduler jobs call it from their own threads.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._mailboxes: dict[int, deque] = {}
+
+    def submit(self, chat_id: int, fn: Callable, *args, **kwargs) -> None:
+        item = (int(chat_id), fn, args, kwargs)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._enqueue(*item)
+        else:
+            self._loop.call_soon_threadsafe(self._enqueue, *item)
+
+    def _enqueue(self, chat_id: int, fn: Callable, args: tuple, kwargs: dict) -> None:
+        box = self._mailboxes.get(chat_id)
+        schedule = box is None
+        if schedule:
+            box = self._mailboxes[chat_id] = deque()
+        box.append((fn, args, kwargs))
+        metrics.inc("actor_tasks")
+        metrics.set_max("actor_mailbox_peak", len(box))
+        if schedule:
+            self._loop.create_task(self._drain(chat_id))
+
+    async def _drain(self, chat_id: int) -> None:
+        from sqlalchemy.util.concurrency import greenlet_spawn
+
+        box = self._mailboxes[chat_id]
+        try:
+            while box:
+                fn, args, kwargs = box.popleft()
+                try:
+                    await greenlet_spawn(fn, *args, **kwargs)
+                except Exception:
+                    logger.exception("Task for chat %s failed", chat_id)
+        finally:
+            self._mailboxes.pop(chat_id, None)
+
+    def pending(self) -> dict[int, int]:
+        return {k: len(v) for k, v in self._mailboxes.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        pass
+
+
+_executor = None
+_executor_lock = threading.Lock()
+# set when a runtime installs its own executor (asyncio); routing is then mandatory
+_installed = False
+
+
+def set_chat_actors(executor) -> None:
+    """Replace the executor; anything with ``submit(chat_id, fn, *args)`` works."""
+    global _executor, _installed
+    with _executor_lock:
+        _executor = executor
+        _installed = True
+
+
+def get_chat_actors() -> ChatActorExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ChatActorExecutor(
+                    workers=getattr(Settings, "CHAT_ACTOR_WORKERS", 16)
+                )
+    return _executor
+
+
+def per_chat(chat_of: Callable[..., int | None]):
+    """Run the decorated handler/job on the actor of ``chat_of(*args)``.
+
+    Falls back to a direct call when CHAT_ACTORS is off or no chat id can be
+    derived from the arguments.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not (_installed or getattr(Settings, "CHAT_ACTORS", False)):
+                return fn(*args, **kwargs)
+            try:
+                chat_id = chat_of(*args, **kwargs)
+            except Exception:
+                chat_id = None
+            if chat_id is None:
+                return fn(*args, **kwargs)
+            executor = get_chat_actors()
+            owns = getattr(executor, "owns", None)
+            if owns is not None and owns(chat_id):
+                # already on this chat's dispatcher shard
+                return fn(*args, **kwargs)
+            executor.submit(chat_id, fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def chat_from_callback_data(call) -> int | None:
+    """``draw:{chat_id}``, ``color:{chat_id}:...``, ``dump:{chat_id}:...``"""
+    parts = (call.data or "").split(":")
+    if len(parts) > 1 and parts[1].lstrip("-").isdigit():
+        return int(parts[1])
+    return call.message.chat.id if call.message else None
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+
+from config import Settings
+from app.utils import metrics
+from app.workers.outbox import PRIORITY_INFO, outbox
+from app.workers.timing_wheel import get_timer_wheel
+
+# deleteMessages accepts up to 100 ids
+MAX_IDS = 100
+
+
+def _job_id(chat_id: int) -> str:
+    return f"delete_batch:{chat_id}"
+
+
+class DeleteBatcher:
+    """Collects messages to delete per chat and removes them with one
+    ``delete_messages`` call per chat every ``delay`` seconds (or 100 ids)."""
+
+    def __init__(self, delay: float | None = None) -> None:
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._pending: dict[int, list[int]] = {}
+
+    @property
+    def delay(self) -> float:
+        if self._delay is not None:
+            return self._delay
+        return float(getattr(Settings, "DELETE_BATCH_SECONDS", 1))
+
+    def delete(self, chat_id: int, message_id: int) -> None:
+        chat_id = int(chat_id)
+        with self._lock:
+            ids = self._pending.setdefault(chat_id, [])
+            ids.append(int(message_id))
+            n = len(ids)
+        metrics.inc("delete_requested")
+        if n >= MAX_IDS or self.delay <= 0:
+            get_timer_wheel().cancel(_job_id(chat_id))
+            self.flush(chat_id)
+        elif n == 1:
+            get_timer_wheel().schedule(_job_id(chat_id), self.delay, self.flush, chat_id)
+
+    def flush(self, chat_id: int) -> None:
+        with self._lock:
+            ids = self._pending.pop(chat_id, None)
+        if not ids:
+            return
+        metrics.inc("delete_batches")
+        outbox.call(chat_id, "delete_messages", chat_id, ids, priority=PRIORITY_INFO)
+
+
+delete_batcher = DeleteBatcher()
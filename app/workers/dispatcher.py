@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Callable
+
+from app.utils import metrics
+from app.workers.chat_actors import chat_from_callback_data
+
+logger = logging.getLogger("dispatcher")
+
+
+def update_chat_id(update) -> int | None:
+    """The chat an update belongs to (callback data names the game's chat)."""
+    if update.message is not None:
+        return update.message.chat.id
+    if update.callback_query is not None:
+        return chat_from_callback_data(update.callback_query)
+    if update.my_chat_member is not None:
+        return update.my_chat_member.chat.id
+    # inline queries/results have no chat; keep each user's in order
+    for inline in (update.inline_query, update.chosen_inline_result):
+        if inline is not None:
+            return inline.from_user.id
+    return None
+
+
+class ShardedDispatcher:
+    """Updates and chat tasks on ``shards`` threads, chat ``c`` on shard ``c % shards``.
+
+    Everything for one chat (its updates and, through ``submit``, its timer
+    jobs) runs on one thread in arrival order, so a chat's moves never race
+    each other; other chats proceed on the other shards. Installed with
+    ``set_chat_actors`` it replaces the actor pool, and ``per_chat`` handlers
+    already running on their chat's shard are called inline.
+    """
+
+    def __init__(self, shards: int = 8) -> None:
+        self._n = max(1, int(shards))
+        self._queues: list[queue.Queue] = [queue.Queue() for _ in range(self._n)]
+        self._local = threading.local()
+        self._threads: list[threading.Thread] = []
+        self._process: Callable[[list], None] | None = None
+        for i in range(self._n):
+            t = threading.Thread(target=self._work, args=(i,), name=f"shard-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def shard_of(self, chat_id: int) -> int:
+        return int(chat_id) % self._n
+
+    def owns(self, chat_id: int) -> bool:
+        """True on the shard thread that ``chat_id`` belongs to."""
+        return getattr(self._local, "shard", None) == self.shard_of(chat_id)
+
+    # -------------------- producers --------------------
+
+    def submit(self, chat_id: int, fn: Callable, *args, **kwargs) -> None:
+        self._put(self.shard_of(chat_id), (fn, args, kwargs))
+
+    def attach(self, bot) -> None:
+        """Route ``bot.process_new_updates`` (polling and webhook) through the shards."""
+        self._process = bot.process_new_updates
+
+        def route(updates: list) -> None:
+            for update in updates:
+                # TeleBot advances its polling offset inside process_new_updates
+                if update.update_id > bot.last_update_id:
+                    bot.last_update_id = update.update_id
+                chat_id = update_chat_id(update)
+                shard = self.shard_of(update.update_id if chat_id is None else chat_id)
+                self._put(shard, (self._process, ([update],), {}))
+
+        bot.process_new_updates = route
+
+    def _put(self, shard: int, task: tuple) -> None:
+        q = self._queues[shard]
+        q.put(task)
+        metrics.inc("dispatch_tasks")
+        metrics.set_max(f"dispatch_shard{shard}_peak", q.qsize())
+
+    # -------------------- workers --------------------
+
+    def _work(self, shard: int) -> None:
+        self._local.shard = shard
+        q = self._queues[shard]
+        while True:
+            task = q.get()
+            if task is None:
+                return
+            fn, args, kwargs = task
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                logger.exception("Task on shard %s failed", shard)
+
+    def depths(self) -> list[int]:
+        """Queued tasks per shard."""
+        return [q.qsize() for q in self._queues]
+
+    def pending(self) -> dict[int, int]:
+        return {i: d for i, d in enumerate(self.depths()) if d}
+
+    def shutdown(self, wait: bool = True) -> None:
+        for q in self._queues:
+            q.put(None)
+        if wait:
+            for t in self._threads:
+                t.join(timeout=5)
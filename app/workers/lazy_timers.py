@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Hashable
+
+
+class LazyTimers:
+    """Timers that are never cancelled in the underlying scheduler.
+
+    ``arm`` only records the latest deadline for a key; the scheduler holds at
+    most one callback per key. When it fires it re-arms itself for the rest of
+    the time if the deadline moved, runs the job if it is due, or does nothing
+    if the key was cancelled meanwhile. Jobs must tolerate a late or stale call
+    (the turn/UNO jobs check their token).
+
+    ``schedule(key, seconds, fn, args)`` is the wrapped scheduler operation
+    (replacing an existing callback of the same key).
+    """
+
+    # scheduler clocks differ slightly; don't re-arm for less than this
+    SLACK = 0.05
+
+    def __init__(self, schedule: Callable[[Hashable, float, Callable, list], None]) -> None:
+        self._schedule = schedule
+        self._lock = threading.Lock()
+        # key -> (deadline, fn, args) of the latest arm
+        self._latest: dict[Hashable, tuple[float, Callable, list]] = {}
+        # key -> when the pending scheduler callback fires
+        self._armed: dict[Hashable, float] = {}
+
+    def arm(self, key: Hashable, seconds: float, fn: Callable, args: list) -> None:
+        deadline = time.monotonic() + float(seconds)
+        with self._lock:
+            self._latest[key] = (deadline, fn, args)
+            fires_at = self._armed.get(key)
+            if fires_at is not None and fires_at <= deadline:
+                return
+            self._armed[key] = deadline
+        self._schedule(key, seconds, self._fire, [key])
+
+    def cancel(self, key: Hashable) -> None:
+        with self._lock:
+            self._latest.pop(key, None)
+
+    def _fire(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._latest.get(key)
+            if entry is None:
+                self._armed.pop(key, None)
+                return
+            deadline, fn, args = entry
+            remaining = deadline - time.monotonic()
+            if remaining > self.SLACK:
+                self._armed[key] = deadline
+            else:
+                del self._latest[key]
+                self._armed.pop(key, None)
+
+        if remaining > self.SLACK:
+            self._schedule(key, remaining, self._fire, [key])
+            return
+        fn(*args)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._latest)
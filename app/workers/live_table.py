@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from config import Settings
+from app.utils import metrics
+from app.workers.outbox import outbox
+from app.workers.timing_wheel import get_timer_wheel
+
+
+def _job_id(chat_id: int) -> str:
+    return f"live_table:{chat_id}"
+
+
+class LiveTable:
+    """Debounced in-place edits of each game's table message.
+
+    ``update`` only records the newest text for a chat; the first update arms
+    a timer and when it fires the latest text goes out as one
+    ``edit_message_text``. Moves made in between are never shown separately.
+    An edit identical to what the message already shows is skipped (Telegram
+    rejects it with "message is not modified").
+    """
+
+    def __init__(self, delay: float | None = None) -> None:
+        self._delay = delay
+        self._lock = threading.Lock()
+        # chat_id -> (message_id, text, reply_markup) waiting for the timer
+        self._pending: dict[int, tuple[int, str, Any]] = {}
+        # chat_id -> (message_id, text) last sent
+        self._shown: dict[int, tuple[int, str]] = {}
+
+    @property
+    def delay(self) -> float:
+        if self._delay is not None:
+            return self._delay
+        return float(getattr(Settings, "LIVE_TABLE_DEBOUNCE_SECONDS", 1))
+
+    def update(self, chat_id: int, message_id: int, text: str, reply_markup: Any = None) -> None:
+        chat_id = int(chat_id)
+        with self._lock:
+            first = chat_id not in self._pending
+            self._pending[chat_id] = (int(message_id), text, reply_markup)
+        if not first:
+            metrics.inc("table_edits_coalesced")
+            return
+        if self.delay <= 0:
+            self.flush(chat_id)
+            return
+        get_timer_wheel().schedule(_job_id(chat_id), self.delay, self.flush, chat_id)
+
+    def flush(self, chat_id: int) -> None:
+        with self._lock:
+            entry = self._pending.pop(chat_id, None)
+            if entry is None:
+                return
+            message_id, text, reply_markup = entry
+            if self._shown.get(chat_id) == (message_id, text):
+                return
+            self._shown[chat_id] = (message_id, text)
+        self._edit(chat_id, message_id, text, reply_markup)
+
+    def close(self, chat_id: int, message_id: int, text: str) -> None:
+        """Final edit (no keyboard) right away, dropping any pending update."""
+        chat_id = int(chat_id)
+        with self._lock:
+            self._pending.pop(chat_id, None)
+            self._shown.pop(chat_id, None)
+        get_timer_wheel().cancel(_job_id(chat_id))
+        self._edit(chat_id, int(message_id), text, None)
+
+    def forget(self, chat_id: int) -> None:
+        """Drop a chat's table without editing it (the game is gone)."""
+        chat_id = int(chat_id)
+        with self._lock:
+            self._pending.pop(chat_id, None)
+            self._shown.pop(chat_id, None)
+        get_timer_wheel().cancel(_job_id(chat_id))
+
+    @staticmethod
+    def _edit(chat_id: int, message_id: int, text: str, reply_markup: Any) -> None:
+        metrics.inc("table_edits")
+        # edit_message_text(text, chat_id, message_id, ...)
+        outbox.call(
+            chat_id,
+            "edit_message_text",
+            text,
+            chat_id,
+            message_id,
+            reply_markup=reply_markup,
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
+
+
+live_table = LiveTable()
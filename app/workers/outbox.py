@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable
+
+from config import Settings
+from app.utils import metrics
+
+logger = logging.getLogger("outbox")
+
+# lower goes first
+PRIORITY_GAME = 0  # moves, timeouts, prompts, results
+PRIORITY_INFO = 1  # level-ups and other extras
+_PRIORITIES = 2
+
+MAX_RETRIES = 5
+# Telegram's limit for one text message
+MAX_TEXT = 4096
+
+# messages collected by ``Outbox.batch`` (contextvar: works in threads and greenlets)
+_batch: ContextVar["_Batch | None"] = ContextVar("outbox_batch", default=None)
+
+
+class _Batch:
+    __slots__ = ("chat_id", "parts")
+
+    def __init__(self, chat_id: int) -> None:
+        self.chat_id = chat_id
+        self.parts: list[tuple[str, dict, int]] = []
+
+
+def coalesce(
+    parts: list[tuple[str, dict, int]], limit: int = MAX_TEXT
+) -> list[tuple[str, dict, int]]:
+    """Merge ``(text, send kwargs, priority)`` parts into as few messages as possible.
+
+    A part with a ``reply_markup`` closes its message (one keyboard per
+    message); parts with a different ``parse_mode`` or that would push the
+    text over ``limit`` start a new one.
+    """
+    out: list[tuple[str, dict, int]] = []
+    texts: list[str] = []
+    kw: dict = {}
+    prio = PRIORITY_INFO
+    size = 0
+
+    def close() -> None:
+        nonlocal texts, kw, prio, size
+        if texts:
+            out.append(("\n\n".join(texts), kw, prio))
+        texts, kw, prio, size = [], {}, PRIORITY_INFO, 0
+
+    for text, part_kw, part_prio in parts:
+        if texts and (
+            part_kw.get("parse_mode") != kw.get("parse_mode")
+            or size + 2 + len(text) > limit
+        ):
+            close()
+        if not texts:
+            kw = {k: v for k, v in part_kw.items() if k != "reply_markup"}
+        elif part_kw.get("disable_web_page_preview"):
+            kw["disable_web_page_preview"] = True
+        texts.append(text)
+        size += len(text) + (2 if size else 0)
+        prio = min(prio, part_prio)
+        if part_kw.get("reply_markup") is not None:
+            kw["reply_markup"] = part_kw["reply_markup"]
+            close()
+    close()
+    return out
+
+
+class _Bucket:
+    __slots__ = ("rate", "capacity", "tokens", "stamp")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _Chat:
+    __slots__ = ("queues", "bucket", "blocked_until", "busy", "gen")
+
+    def __init__(self, bucket: _Bucket) -> None:
+        self.queues = [deque() for _ in range(_PRIORITIES)]
+        self.bucket = bucket
+        self.blocked_until = 0.0
+        # one request in flight per chat keeps its messages in order
+        self.busy = False
+        self.gen = 0
+
+    def head(self) -> tuple[int, list] | None:
+        for prio, q in enumerate(self.queues):
+            if q:
+                return prio, q[0]
+        return None
+
+
+class Outbox:
+    """Queued Bot API calls with global and per-chat token buckets.
+
+    ``send``/``call`` only enqueue. A dispatcher thread picks the most urgent
+    chat whose bucket has a token (groups ~20/min, private chats ~1/s, all
+    chats together ~25/s) and hands the call to a worker pool. A 429 puts the
+    message back at the head of its chat and blocks the chat for
+    ``retry_after`` seconds. Messages of one chat keep their order within a
+    priority.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._chats: dict[int, _Chat] = {}
+        self._seq = itertools.count()
+        # (ready_at, seq, chat_id, gen): chats waiting for a token / retry_after
+        self._waiting: list[tuple] = []
+        # (priority, seq, chat_id, gen): chats that may send now
+        self._ready: list[tuple] = []
+        self._call: Callable[..., Any] | None = None
+        self._global = _Bucket(
+            getattr(Settings, "OUTBOX_GLOBAL_PER_SECOND", 25),
+            getattr(Settings, "OUTBOX_GLOBAL_PER_SECOND", 25),
+        )
+        self._pool: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def bind(self, call: Callable[..., Any]) -> None:
+        """``call(method, *args, **kwargs)`` performs one Bot API request."""
+        self._call = call
+
+    # -------------------- producers --------------------
+
+    def send(self, chat_id: int, text: str, *, priority: int = PRIORITY_GAME, **kwargs) -> None:
+        batch = _batch.get()
+        if batch is not None and int(chat_id) == batch.chat_id:
+            batch.parts.append((text, kwargs, priority))
+            return
+        self.call(chat_id, "send_message", chat_id, text, priority=priority, **kwargs)
+
+    @contextmanager
+    def batch(self, chat_id: int):
+        """Collect ``send``s to ``chat_id`` and flush them as combined messages."""
+        if _batch.get() is not None:
+            yield
+            return
+        batch = _Batch(int(chat_id))
+        token = _batch.set(batch)
+        try:
+            yield
+        finally:
+            _batch.reset(token)
+            messages = coalesce(batch.parts)
+            if len(batch.parts) > len(messages):
+                metrics.inc("outbox_coalesced", len(batch.parts) - len(messages))
+            for text, kwargs, priority in messages:
+                self.call(
+                    batch.chat_id,
+                    "send_message",
+                    batch.chat_id,
+                    text,
+                    priority=priority,
+                    **kwargs,
+                )
+
+    def call(
+        self, chat_id: int, method: str, *args, priority: int = PRIORITY_GAME, **kwargs
+    ) -> None:
+        if self._call is None:
+            raise RuntimeError("Outbox is not bound to a bot. Call outbox.bind(...).")
+        # [method, args, kwargs, priority, attempts]
+        item = [method, args, kwargs, priority, 0]
+        if not self.running:
+            self._invoke(item)
+            return
+
+        chat_id = int(chat_id)
+        with self._cond:
+            chat = self._chats.get(chat_id)
+            if chat is None:
+                chat = self._chats[chat_id] = _Chat(self._chat_bucket(chat_id))
+            chat.queues[priority].append(item)
+            if not chat.busy:
+                self._schedule(chat_id, chat)
+            self._cond.notify()
+        metrics.inc("outbox_enqueued")
+
+    @staticmethod
+    def _chat_bucket(chat_id: int) -> _Bucket:
+        if chat_id < 0:
+            per_minute = float(getattr(Settings, "OUTBOX_GROUP_PER_MINUTE", 20))
+            return _Bucket(per_minute / 60.0, 3)
+        return _Bucket(float(getattr(Settings, "OUTBOX_PRIVATE_PER_SECOND", 1)), 1)
+
+    # -------------------- dispatcher --------------------
+
+    def _schedule(self, chat_id: int, chat: _Chat) -> None:
+        # caller holds the lock
+        head = chat.head()
+        if head is None:
+            if not chat.busy:
+                self._chats.pop(chat_id, None)
+            return
+        chat.gen += 1
+        now = time.monotonic()
+        ready_at = max(chat.blocked_until, now + chat.bucket.wait_time(now))
+        if ready_at <= now:
+            heapq.heappush(self._ready, (head[0], next(self._seq), chat_id, chat.gen))
+        else:
+            heapq.heappush(self._waiting, (ready_at, next(self._seq), chat_id, chat.gen))
+
+    def _next(self) -> tuple[int, _Chat, list] | None:
+        # caller holds the lock; returns None if nothing can go right now
+        now = time.monotonic()
+        while self._waiting and self._waiting[0][0] <= now:
+            _, _, chat_id, gen = heapq.heappop(self._waiting)
+            chat = self._chats.get(chat_id)
+            if chat is not None and chat.gen == gen:
+                head = chat.head()
+                if head is not None:
+                    heapq.heappush(self._ready, (head[0], next(self._seq), chat_id, gen))
+
+        if not self._ready or self._global.wait_time(now) > 0:
+            return None
+        while self._ready:
+            _, _, chat_id, gen = heapq.heappop(self._ready)
+            chat = self._chats.get(chat_id)
+            if chat is None or chat.gen != gen or chat.busy:
+                continue
+            head = chat.head()
+            if head is None:
+                continue
+            prio, item = head
+            chat.queues[prio].popleft()
+            chat.busy = True
+            chat.bucket.take(now)
+            self._global.take(now)
+            return chat_id, chat, item
+        return None
+
+    def _timeout(self) -> float:
+        now = time.monotonic()
+        waits = [1.0]
+        if self._waiting:
+            waits.append(self._waiting[0][0] - now)
+        if self._ready:
+            waits.append(self._global.wait_time(now))
+        return max(0.0, min(waits))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while not self._stop:
+                    job = self._next()
+                    if job is not None:
+                        break
+                    self._cond.wait(self._timeout())
+                if job is None:
+                    return
+            chat_id, chat, item = job
+            self._pool.submit(self._deliver, chat_id, chat, item)
+
+    def _deliver(self, chat_id: int, chat: _Chat, item: list) -> None:
+        retry_after = self._invoke(item)
+        with self._cond:
+            chat.busy = False
+            if retry_after is not None and item[4] < MAX_RETRIES:
+                item[4] += 1
+                chat.blocked_until = time.monotonic() + retry_after
+                chat.queues[item[3]].appendleft(item)
+            self._schedule(chat_id, chat)
+            self._cond.notify()
+
+    def _invoke(self, item: list) -> float | None:
+        """Run one request; returns ``retry_after`` on 429, None otherwise."""
+        method, args, kwargs = item[0], item[1], item[2]
+        try:
+            self._call(method, *args, **kwargs)
+            metrics.inc("outbox_sent")
+        except Exception as e:
+            if getattr(e, "error_code", None) == 429:
+                metrics.inc("outbox_429")
+                params = (getattr(e, "result_json", None) or {}).get("parameters") or {}
+                return float(params.get("retry_after") or 1)
+            metrics.inc("outbox_failed")
+            logger.warning("%s failed: %s", method, e)
+        return None
+
+    # -------------------- lifecycle --------------------
+
+    def start(self, workers: int | None = None) -> None:
+        if self._thread is not None:
+            return
+        self._stop = False
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(workers or getattr(Settings, "OUTBOX_WORKERS", 8))),
+            thread_name_prefix="outbox",
+        )
+        self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join(timeout=2)
+        self._thread = None
+        self._pool.shutdown(wait=True)
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(len(q) for c in self._chats.values() for q in c.queues)
+
+
+outbox = Outbox()
+
+
+def coalesced(chat_of: Callable[..., int | None]):
+    """Send everything the decorated handler/job posts to ``chat_of(*args)``
+    as one message (or as few as the length limit and keyboards allow)."""
+
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                chat_id = chat_of(*args, **kwargs)
+            except Exception:
+                chat_id = None
+            if chat_id is None:
+                return fn(*args, **kwargs)
+            with outbox.batch(chat_id):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+import threading
 import time
 import uuid
 from datetime import datetime, timedelta, timezone
@@ -13,12 +15,18 @@ from app.database.repos import GameRepo, OptimisticLockError
 from app.services.game_service import GameService
 from app.utils.db_manager import get_session
 from app.workers.scheduler import get_scheduler
+from app.workers.timing_wheel import get_timer_wheel
+from app.workers.lazy_timers import LazyTimers
 from app.utils.text_models import mention
-from app.utils.announce import podium_lines
+from app.utils.announce import podium_lines, refresh_table
 from app.services.reward_service import apply_rewards_if_needed
 from app.utils.level_up_notify import send_level_up_notifications
+from app.workers.chat_actors import per_chat
+from app.workers.outbox import outbox, coalesced
 
 
+logger = logging.getLogger("timers")
+
 _BOT: TeleBot | None = None
 
 
@@ -45,6 +53,48 @@ def _job_id_uno(chat_id: int, uid: int) -> str:
     return f"uno_uno:{chat_id}:{uid}"
 
 
+def _schedule_now(job_id: str, seconds: float, fn, args: list) -> None:
+    if getattr(Settings, "TIMER_BACKEND", "wheel") == "wheel":
+        get_timer_wheel().schedule(job_id, seconds, fn, *args)
+        return
+    get_scheduler().add_job(
+        func=fn,
+        trigger="date",
+        run_date=_utcnow() + timedelta(seconds=seconds),
+        args=args,
+        id=job_id,
+        replace_existing=True,
+    )
+
+
+def _cancel_now(job_id: str) -> None:
+    if getattr(Settings, "TIMER_BACKEND", "wheel") == "wheel":
+        get_timer_wheel().cancel(job_id)
+        return
+    try:
+        get_scheduler().remove_job(job_id)
+    except Exception:
+        pass
+
+
+# TIMER_LAZY: moves only overwrite the deadline; the pending callback sorts it out
+_lazy = LazyTimers(_schedule_now)
+
+
+def _arm(job_id: str, seconds: float, fn, args: list) -> None:
+    if getattr(Settings, "TIMER_LAZY", False):
+        _lazy.arm(job_id, seconds, fn, args)
+    else:
+        _schedule_now(job_id, seconds, fn, args)
+
+
+def _disarm(job_id: str) -> None:
+    if getattr(Settings, "TIMER_LAZY", False):
+        _lazy.cancel(job_id)
+    else:
+        _cancel_now(job_id)
+
+
 # -------------------- TURN TIMER --------------------
 
 
@@ -72,27 +122,17 @@ def prepare_turn_timer(
 
 
 def cancel_turn_timeout(chat_id: int) -> None:
-    sch = get_scheduler()
-    try:
-        sch.remove_job(_job_id_turn(chat_id))
-    except Exception:
-        pass
+    _disarm(_job_id_turn(chat_id))
 
 
 def schedule_turn_timeout(
     chat_id: int, uid: int, token: str, seconds: int = 30
 ) -> None:
-    sch = get_scheduler()
-    sch.add_job(
-        func=_turn_timeout_job,
-        trigger="date",
-        run_date=_utcnow() + timedelta(seconds=seconds),
-        args=[chat_id, int(uid), token],
-        id=_job_id_turn(chat_id),
-        replace_existing=True,
-    )
+    _arm(_job_id_turn(chat_id), seconds, _turn_timeout_job, [chat_id, int(uid), token])
 
 
+@per_chat(lambda chat_id, *_: chat_id)
+@coalesced(lambda chat_id, *_: chat_id)
 def _turn_timeout_job(chat_id: int, uid: int, token: str) -> None:
     svc = GameService()
 
@@ -223,18 +263,20 @@ def _turn_timeout_job(chat_id: int, uid: int, token: str) -> None:
         kn = km.get("name") or (
             ("@" + km["username"]) if km.get("username") else str(ku)[-4:]
         )
-        _bot().send_message(
+        outbox.send(
             chat_id,
             f"🚫 {mention(ku, kn)} вибув(ла) з гри: у руці стало <b>{cards}</b> карт (ліміт {svc.MAX_HAND}).",
             parse_mode="HTML",
             disable_web_page_preview=True,
         )
 
+    refresh_table(Keyboards(), chat_id, game_state, svc, Settings())
+
     if finished_game:
         # finish and announce results
         cancel_turn_timeout(chat_id)
         try:
-            _bot().send_message(
+            outbox.send(
                 chat_id,
                 "\n".join(podium_lines(game_state)),
                 parse_mode="HTML",
@@ -247,7 +289,7 @@ def _turn_timeout_job(chat_id: int, uid: int, token: str) -> None:
         return
 
     # 2) стандартне повідомлення таймаута
-    _bot().send_message(
+    outbox.send(
         chat_id,
         f"⏳ Гравець {mention(uid, name)} не зробив хід за {seconds}с — штраф: +2 карти.\n"
         f"➡️ Тепер хід: {mention(next_uid, next_name)}",
@@ -288,25 +330,15 @@ def clear_uno_state(state: dict) -> None:
 
 
 def cancel_uno_timeout(chat_id: int, uid: int) -> None:
-    sch = get_scheduler()
-    try:
-        sch.remove_job(_job_id_uno(chat_id, uid))
-    except Exception:
-        pass
+    _disarm(_job_id_uno(chat_id, uid))
 
 
 def schedule_uno_timeout(chat_id: int, uid: int, token: str, seconds: int = 10) -> None:
-    sch = get_scheduler()
-    sch.add_job(
-        func=_uno_timeout_job,
-        trigger="date",
-        run_date=_utcnow() + timedelta(seconds=seconds),
-        args=[chat_id, int(uid), token],
-        id=_job_id_uno(chat_id, uid),
-        replace_existing=True,
-    )
+    _arm(_job_id_uno(chat_id, uid), seconds, _uno_timeout_job, [chat_id, int(uid), token])
 
 
+@per_chat(lambda chat_id, *_: chat_id)
+@coalesced(lambda chat_id, *_: chat_id)
 def _uno_timeout_job(chat_id: int, uid: int, token: str) -> None:
     svc = GameService()
 
@@ -427,12 +459,14 @@ def _uno_timeout_job(chat_id: int, uid: int, token: str) -> None:
     if next_uid is not None and next_token is not None:
         schedule_turn_timeout(chat_id, next_uid, next_token, seconds=30)
 
+    live = refresh_table(Keyboards(), chat_id, game_state, svc, Settings())
+
     if finished_game:
         # finish and announce results
         cancel_uno_timeout(chat_id, uid)
         cancel_turn_timeout(chat_id)
         try:
-            _bot().send_message(
+            outbox.send(
                 chat_id,
                 "\n".join(podium_lines(game_state)),
                 parse_mode="HTML",
@@ -451,7 +485,7 @@ def _uno_timeout_job(chat_id: int, uid: int, token: str) -> None:
                 ku = int(ev.get("uid") or 0)
                 cards = int(ev.get("cards") or 0)
                 nm = meta_now.get(str(ku), {}).get("name") or str(ku)[-4:]
-                _bot().send_message(
+                outbox.send(
                     chat_id,
                     f"🚫 {mention(ku, nm)} вибув(ла) з гри — у руці стало <b>{cards}</b> карт (ліміт <b>{svc.MAX_HAND}</b>).",
                     parse_mode="HTML",
@@ -478,6 +512,16 @@ def _uno_timeout_job(chat_id: int, uid: int, token: str) -> None:
 
     extra = ", пропуск ходу" if skipped_now else ""
 
+    if live:
+        # the table message shows the rest
+        outbox.send(
+            chat_id,
+            f"⚠️ {mention(uid, name)} не сказав <b>UNO</b> за <b>{seconds}</b>с → <b>+2</b>{extra}.",
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
+        return
+
     # ---- повний статус столу ----
     settings = Settings()
     kb = Keyboards()
@@ -513,7 +557,7 @@ def _uno_timeout_job(chat_id: int, uid: int, token: str) -> None:
     if cur_uid is not None:
         turn_line = f"➡️ <b>Тепер хід:</b> {mention(cur_uid, cur_name)}"
 
-    _bot().send_message(
+    outbox.send(
         chat_id,
         (
             f"⚠️ {mention(uid, name)} не сказав <b>UNO</b> за <b>{seconds}</b>с → <b>+2</b>{extra}.\n"
@@ -530,3 +574,49 @@ def _uno_timeout_job(chat_id: int, uid: int, token: str) -> None:
 def clear_uno_timer(state: dict) -> None:
     # alias для старої назви
     clear_uno_state(state)
+
+
+# -------------------- RECOVERY --------------------
+
+
+def recover_timers(overdue_per_second: float | None = None) -> int:
+    """Re-arm turn/UNO timers of playing games from ``state["timers"]``.
+
+    Timers live in memory only, so after a restart every running game would
+    hang. Deadlines still in the future are re-armed as they were; overdue ones
+    are spread out at ``overdue_per_second`` so their announcements do not hit
+    Telegram's flood limits all at once. Returns the number of timers armed.
+    """
+    rate = float(
+        overdue_per_second
+        or getattr(Settings, "TIMER_RECOVERY_PER_SECOND", 20)
+    )
+    now = time.time()
+    armed = overdue = 0
+
+    with get_session(readonly=True) as s:
+        for chat_id, state in GameRepo(s).iter_playing_states():
+            timers = state.get("timers") or {}
+            for kind, schedule in (
+                ("turn", schedule_turn_timeout),
+                ("uno", schedule_uno_timeout),
+            ):
+                t = timers.get(kind) or {}
+                if not t.get("token") or not t.get("uid"):
+                    continue
+                remaining = float(t.get("expires_at") or 0) - now
+                if remaining <= 0:
+                    remaining = overdue / rate
+                    overdue += 1
+                schedule(int(chat_id), int(t["uid"]), t["token"], seconds=remaining)
+                armed += 1
+
+    logger.info("Recovered %s timers (%s overdue)", armed, overdue)
+    return armed
+
+
+def start_timer_recovery() -> threading.Thread:
+    """Run ``recover_timers`` in the background so startup does not wait on it."""
+    thread = threading.Thread(target=recover_timers, name="timer-recovery", daemon=True)
+    thread.start()
+    return thread
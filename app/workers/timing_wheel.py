@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable
+
+from config import Settings
+from app.utils import metrics
+
+logger = logging.getLogger("timing_wheel")
+
+
+class _Timer:
+    __slots__ = ("key", "slot", "rounds", "fn", "args")
+
+    def __init__(self, key: Hashable, slot: int, rounds: int, fn: Callable, args: tuple) -> None:
+        self.key = key
+        self.slot = slot
+        self.rounds = rounds
+        self.fn = fn
+        self.args = args
+
+
+class HashedTimingWheel:
+    """Keyed one-shot timers on a hashed wheel driven by one thread.
+
+    ``schedule`` and ``cancel`` are O(1): a timer lives in the slot of its
+    deadline tick with the number of full wheel turns still to wait. Arming a
+    key that is already armed replaces it (like ``replace_existing``). Every
+    tick the due timers of one slot are handed to the worker pool together.
+    Resolution is one tick; timers never fire early.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 1024, workers: int = 10) -> None:
+        self.tick = float(tick)
+        self._n = int(slots)
+        self._slots: list[dict[Hashable, _Timer]] = [{} for _ in range(self._n)]
+        self._timers: dict[Hashable, _Timer] = {}
+        self._lock = threading.Lock()
+        self._cursor = 0
+        self._t0 = time.monotonic()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(workers)), thread_name_prefix="timer"
+        )
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def schedule(self, key: Hashable, delay: float, fn: Callable, *args) -> None:
+        due_tick = math.ceil((time.monotonic() + float(delay) - self._t0) / self.tick)
+        with self._lock:
+            old = self._timers.pop(key, None)
+            if old is not None:
+                del self._slots[old.slot][key]
+            ticks = max(1, due_tick - self._cursor)
+            slot = (self._cursor + ticks) % self._n
+            timer = _Timer(key, slot, (ticks - 1) // self._n, fn, args)
+            self._slots[slot][key] = timer
+            self._timers[key] = timer
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            timer = self._timers.pop(key, None)
+            if timer is None:
+                return False
+            del self._slots[timer.slot][key]
+            return True
+
+    # -------------------- ticking --------------------
+
+    def _advance(self, now: float) -> list[_Timer]:
+        due: list[_Timer] = []
+        target = int((now - self._t0) / self.tick)
+        with self._lock:
+            while self._cursor < target:
+                self._cursor += 1
+                slot = self._slots[self._cursor % self._n]
+                if not slot:
+                    continue
+                for key in list(slot):
+                    timer = slot[key]
+                    if timer.rounds:
+                        timer.rounds -= 1
+                        continue
+                    del slot[key]
+                    del self._timers[key]
+                    due.append(timer)
+        return due
+
+    def _fire(self, due: list[_Timer]) -> None:
+        metrics.inc("timers_fired", len(due))
+        for timer in due:
+            try:
+                self._pool.submit(self._call, timer)
+            except RuntimeError:
+                # shutting down
+                return
+
+    @staticmethod
+    def _call(timer: _Timer) -> None:
+        try:
+            timer.fn(*timer.args)
+        except Exception:
+            logger.exception("Timer %s failed", timer.key)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            due = self._advance(time.monotonic())
+            if due:
+                self._fire(due)
+            next_tick = self._t0 + (self._cursor + 1) * self.tick
+            self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="timing-wheel", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._thread = None
+        self._pool.shutdown(wait=False)
+
+
+_wheel: HashedTimingWheel | None = None
+_wheel_lock = threading.Lock()
+
+
+def get_timer_wheel() -> HashedTimingWheel:
+    global _wheel
+    if _wheel is None:
+        with _wheel_lock:
+            if _wheel is None:
+                _wheel = HashedTimingWheel(
+                    tick=getattr(Settings, "TIMER_TICK_SECONDS", 0.1)
+                )
+                _wheel.start()
+    return _wheel
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from app.utils import metrics
+
+logger = logging.getLogger("webhook")
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class _SeenUpdates:
+    """The last ``capacity`` update ids (Telegram re-sends unacknowledged ones)."""
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        self._ids: set[int] = set()
+        self._order: deque[int] = deque()
+        self._capacity = int(capacity)
+        self._lock = threading.Lock()
+
+    def add(self, update_id: int) -> bool:
+        """False if ``update_id`` was already seen."""
+        with self._lock:
+            if update_id in self._ids:
+                return False
+            self._ids.add(update_id)
+            self._order.append(update_id)
+            if len(self._order) > self._capacity:
+                self._ids.discard(self._order.popleft())
+            return True
+
+    def forget(self, update_id: int) -> None:
+        with self._lock:
+            self._ids.discard(update_id)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Telegram opens up to max_connections (40 by default) at once
+    request_queue_size = 128
+
+
+class WebhookServer:
+    """Receives Telegram webhook POSTs and feeds them to ``process``.
+
+    Request threads only validate, deduplicate by ``update_id`` and put the
+    update (raw dict) on a bounded queue, then answer 200. ``workers`` threads
+    drain the queue. When the queue is full the request gets 503 and Telegram
+    delivers the update again later, so nothing is lost under overload.
+
+    The server speaks plain HTTP; put it behind a TLS-terminating proxy (or use
+    ``benchmarks/replay_updates.py`` to post recorded updates to it locally).
+    """
+
+    def __init__(
+        self,
+        process: Callable[[dict], None],
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        path: str = "/",
+        secret: str = "",
+        queue_size: int = 1000,
+        workers: int = 8,
+    ) -> None:
+        self._process = process
+        self.path = path
+        self._secret = secret
+        self._queue: queue.Queue[dict | None] = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._seen = _SeenUpdates()
+        self._workers = max(1, int(workers))
+        self._threads: list[threading.Thread] = []
+        self._httpd = _HTTPServer((host, int(port)), self._handler_class())
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._httpd.server_address[:2]
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    # -------------------- ingestion --------------------
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                self._reply(server.accept(self.path, self.headers, self._body()))
+
+            def _body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length > 0 else b""
+
+            def _reply(self, code: int) -> None:
+                self.send_response(code)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+    def accept(self, path: str, headers, body: bytes) -> int:
+        """Validate and enqueue one POST; returns the HTTP status to answer."""
+        if path.split("?", 1)[0] != self.path:
+            return 404
+        if self._secret and not hmac.compare_digest(
+            headers.get(SECRET_HEADER) or "", self._secret
+        ):
+            return 403
+        try:
+            update = json.loads(body)
+            update_id = int(update["update_id"])
+        except (ValueError, KeyError, TypeError):
+            return 400
+
+        metrics.inc("webhook_received")
+        if not self._seen.add(update_id):
+            metrics.inc("webhook_duplicates")
+            return 200
+        try:
+            self._queue.put_nowait(update)
+        except queue.Full:
+            # forget it so Telegram's retry is not taken for a duplicate
+            self._seen.forget(update_id)
+            metrics.inc("webhook_rejected")
+            return 503
+        metrics.set_max("webhook_queue_peak", self._queue.qsize())
+        return 200
+
+    # -------------------- workers --------------------
+
+    def _work(self) -> None:
+        while True:
+            update = self._queue.get()
+            if update is None:
+                return
+            try:
+                self._process(update)
+            except Exception:
+                logger.exception("Update %s failed", update.get("update_id"))
+
+    def _start_workers(self) -> None:
+        for i in range(self._workers):
+            t = threading.Thread(target=self._work, name=f"webhook-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info("Webhook server listening on %s:%s%s", *self.address, self.path)
+
+    def serve_forever(self) -> None:
+        self._start_workers()
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+            # queued updates are still processed before the workers exit
+            for _ in self._threads:
+                self._queue.put(None)
+            for t in self._threads:
+                t.join(timeout=5)
+            self._threads.clear()
+
+    def shutdown(self) -> None:
+        """Make ``serve_forever`` return (call from another thread)."""
+        self._httpd.shutdown()
@@ -0,0 +1,113 @@
+"""Optimistic-lock conflicts under a burst of moves in one chat.
+
+Fires ``--moves`` concurrent "draw a card" transactions at one game, each with
+the same 3-attempt retry loop the handlers use, first from plain threads
+(TeleBot's worker pool) and then through ``ChatActorExecutor``.
+
+    python benchmarks/bench_chat_actors.py --moves 200 --threads 16
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_DB = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB}"
+os.environ.setdefault("GAME_CACHE", "0")
+
+from app.utils import metrics  # noqa: E402
+from app.utils.db_manager import init_db, get_session  # noqa: E402
+from app.database.repos import GameRepo, OptimisticLockError  # noqa: E402
+from app.services.game_service import GameService  # noqa: E402
+from app.workers.chat_actors import ChatActorExecutor  # noqa: E402
+
+CHAT_ID = -100
+svc = GameService()
+dropped = 0
+dropped_lock = threading.Lock()
+
+
+def reset_game() -> None:
+    with get_session() as s:
+        repo = GameRepo(s)
+        game = repo.get_by_chat(CHAT_ID) or repo.create_lobby(CHAT_ID, "bench")
+        state = svc.start_game_state([1, 2], seed=1)
+        repo.save(game, game.version, state=state, status="playing")
+
+
+def one_move() -> None:
+    global dropped
+    with get_session() as s:
+        repo = GameRepo(s)
+        game = repo.get_by_chat(CHAT_ID)
+        for _ in range(3):
+            try:
+                state = game.state
+                state["bench_moves"] = int(state.get("bench_moves") or 0) + 1
+                repo.save(game, expected_version=game.version, state=state)
+                return
+            except OptimisticLockError:
+                s.rollback()
+                game = repo.get_by_chat(CHAT_ID)
+    with dropped_lock:
+        dropped += 1
+
+
+def run(label: str, submit, wait, moves: int) -> None:
+    global dropped
+    reset_game()
+    metrics.reset()
+    dropped = 0
+    t0 = time.perf_counter()
+    for _ in range(moves):
+        submit(one_move)
+    wait()
+    dt = time.perf_counter() - t0
+    conflicts = metrics.snapshot().get("game_save_conflicts", 0)
+    with get_session() as s:
+        applied = GameRepo(s).get_by_chat(CHAT_ID).state.get("bench_moves", 0)
+    print(
+        f"{label:<10} moves={moves} applied={applied} conflicts={conflicts} "
+        f"dropped={dropped} time={dt:.2f}s"
+    )
+
+
+def wait_idle(actors: ChatActorExecutor) -> None:
+    while actors.pending():
+        time.sleep(0.002)
+    actors.shutdown(wait=True)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--moves", type=int, default=200)
+    ap.add_argument("--threads", type=int, default=16)
+    args = ap.parse_args()
+    init_db()
+
+    pool = ThreadPoolExecutor(max_workers=args.threads)
+    futures: list = []
+    run(
+        "threads",
+        lambda fn: futures.append(pool.submit(fn)),
+        lambda: [f.result() for f in futures],
+        args.moves,
+    )
+
+    actors = ChatActorExecutor(workers=args.threads)
+    run(
+        "actors",
+        lambda fn: actors.submit(CHAT_ID, fn),
+        lambda: wait_idle(actors),
+        args.moves,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Self-play throughput of ``GameService``: whole games, no Telegram, no database.
+
+Plays ``--games`` seeded games of ``--players`` seats with the headless
+``Simulator`` (``--policy`` names are assigned to seats in turn), fanned out
+over ``--workers`` processes, and reports games/s, moves/s and p50/p99
+latency of every engine call. The seeds are fixed, so two runs play the
+same games and an engine change can be compared against the baseline.
+
+    python benchmarks/bench_selfplay.py --games 5000 --players 4 --policy greedy random
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.simulator import POLICIES, SimResult, run_games  # noqa: E402
+
+
+def percentile(sorted_ns, q: float) -> float:
+    return sorted_ns[min(len(sorted_ns) - 1, int(q * len(sorted_ns)))] / 1000
+
+
+def run(args) -> tuple[SimResult, float]:
+    seeds = list(range(args.seed, args.seed + args.games))
+    chunks = [seeds[i : i + args.chunk] for i in range(0, len(seeds), args.chunk)]
+    options = dict(max_draws=args.max_draws, uno_miss=args.uno_miss, max_moves=args.max_moves)
+    total = SimResult()
+
+    t0 = time.perf_counter()
+    if args.workers <= 1:
+        for chunk in chunks:
+            total.merge(run_games(chunk, args.players, args.policy, **options))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [
+                pool.submit(run_games, chunk, args.players, args.policy, **options)
+                for chunk in chunks
+            ]
+            for f in futures:
+                total.merge(f.result())
+    return total, time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--games", type=int, default=2000)
+    ap.add_argument("--players", type=int, default=4)
+    ap.add_argument("--policy", nargs="+", default=["greedy"], choices=sorted(POLICIES))
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk", type=int, default=50, help="games per worker task")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--max-draws", type=int, default=1)
+    ap.add_argument("--uno-miss", type=float, default=0.1)
+    ap.add_argument("--max-moves", type=int, default=1000)
+    args = ap.parse_args()
+
+    res, elapsed = run(args)
+    print(
+        f"{res.games} games x {args.players} players ({'/'.join(args.policy)}), "
+        f"{args.workers} workers: {res.games / elapsed:.0f} games/s, {res.moves / elapsed:.0f} moves/s"
+    )
+    print(
+        f"finished={res.finished} capped={res.capped} deck_exhausted={res.deck_exhausted} "
+        f"kicks={res.kicks} rejected={res.rejected}"
+    )
+    print(f"{'operation':>20} {'calls':>10} {'p50 us':>9} {'p99 us':>9}")
+    for op, samples in sorted(res.ops.items()):
+        ns = sorted(samples)
+        print(f"{op:>20} {len(ns):>10} {percentile(ns, 0.50):>9.1f} {percentile(ns, 0.99):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
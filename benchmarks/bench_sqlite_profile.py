@@ -0,0 +1,89 @@
+"""Game save throughput on SQLite: plain engine vs. the ``sqlite-wal`` profile.
+
+Every thread owns its own chat and loops over "load game, change it, save"
+transactions, the way concurrent handlers and timer jobs do. Reports saves per
+second and how many transactions died with "database is locked".
+
+    python benchmarks/bench_sqlite_profile.py --threads 16 --saves 200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GAME_CACHE", "0")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.utils import storage_profiles  # noqa: E402
+from app.utils.db_manager import Base  # noqa: E402
+from app.database.repos import GameRepo, OptimisticLockError  # noqa: E402
+from app.services.game_service import GameService  # noqa: E402
+
+svc = GameService()
+
+
+def run(profile: str, threads: int, saves: int) -> tuple[float, int]:
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(
+        url, **storage_profiles.engine_options(url, profile, pool_size=threads)
+    )
+    storage_profiles.configure(engine, url, profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    for chat_id in range(threads):
+        with Session() as s:
+            repo = GameRepo(s)
+            game = repo.create_lobby(chat_id, "bench")
+            state = svc.start_game_state([1, 2], seed=chat_id)
+            repo.save(game, game.version, state=state, status="playing")
+
+    locked = 0
+    locked_lock = threading.Lock()
+
+    def worker(chat_id: int) -> None:
+        nonlocal locked
+        for _ in range(saves):
+            try:
+                with Session() as s:
+                    repo = GameRepo(s)
+                    game = repo.get_by_chat(chat_id)
+                    state = game.state
+                    state["bench_moves"] = int(state.get("bench_moves") or 0) + 1
+                    repo.save(game, expected_version=game.version, state=state)
+            except (OperationalError, OptimisticLockError):
+                with locked_lock:
+                    locked += 1
+
+    pool = [threading.Thread(target=worker, args=(c,)) for c in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    engine.dispose()
+    return (threads * saves - locked) / elapsed, locked
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--saves", type=int, default=200)
+    args = ap.parse_args()
+
+    for profile in ("default", "sqlite-wal"):
+        rate, locked = run(profile, args.threads, args.saves)
+        print(f"{profile:>10}: {rate:8.0f} saves/s   locked/failed: {locked}")
+
+
+if __name__ == "__main__":
+    main()
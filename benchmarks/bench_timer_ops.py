@@ -0,0 +1,110 @@
+"""Scheduler operations per move: APScheduler vs. timing wheel, eager vs. lazy.
+
+A move used to cost a ``remove_job`` plus an ``add_job(replace_existing=True)``
+on the turn timer. Simulates ``--games`` live games making ``--moves`` moves
+each (30s turn timer, nothing fires during the run) and reports moves/s and
+scheduler operations per move.
+
+    python benchmarks/bench_timer_ops.py --games 2000 --moves 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apscheduler.schedulers.background import BackgroundScheduler  # noqa: E402
+
+from app.workers.lazy_timers import LazyTimers  # noqa: E402
+from app.workers.timing_wheel import HashedTimingWheel  # noqa: E402
+
+
+def _noop(*_args) -> None:
+    pass
+
+
+class Counting:
+    """Raw schedule/cancel of one backend, counting calls."""
+
+    def __init__(self, backend: str) -> None:
+        self.ops = 0
+        if backend == "apscheduler":
+            self._sch = BackgroundScheduler(timezone="UTC")
+            self._sch.start()
+            self._wheel = None
+        else:
+            self._sch = None
+            self._wheel = HashedTimingWheel()
+            self._wheel.start()
+
+    def schedule(self, key, seconds, fn, args) -> None:
+        self.ops += 1
+        if self._wheel is not None:
+            self._wheel.schedule(key, seconds, fn, *args)
+            return
+        self._sch.add_job(
+            fn,
+            trigger="date",
+            run_date=datetime.now(timezone.utc) + timedelta(seconds=seconds),
+            args=args,
+            id=key,
+            replace_existing=True,
+        )
+
+    def cancel(self, key) -> None:
+        self.ops += 1
+        if self._wheel is not None:
+            self._wheel.cancel(key)
+            return
+        try:
+            self._sch.remove_job(key)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        if self._wheel is not None:
+            self._wheel.stop()
+        else:
+            self._sch.shutdown(wait=False)
+
+
+def run(backend: str, lazy: bool, games: int, moves: int) -> tuple[float, float]:
+    raw = Counting(backend)
+    if lazy:
+        timers = LazyTimers(raw.schedule)
+        arm, cancel = timers.arm, timers.cancel
+    else:
+        arm, cancel = raw.schedule, raw.cancel
+
+    keys = [f"uno_turn:{-1000 - g}" for g in range(games)]
+    t0 = time.perf_counter()
+    for _ in range(moves):
+        for key in keys:
+            # what a handler does on every move
+            cancel(key)
+            arm(key, 30, _noop, [key])
+    elapsed = time.perf_counter() - t0
+    raw.close()
+    total = games * moves
+    return total / elapsed, raw.ops / total
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--games", type=int, default=2000)
+    ap.add_argument("--moves", type=int, default=20)
+    args = ap.parse_args()
+
+    for backend in ("apscheduler", "wheel"):
+        for lazy in (False, True):
+            rate, ops = run(backend, lazy, args.games, args.moves)
+            mode = "lazy" if lazy else "eager"
+            print(f"{backend:>11} {mode:>5}: {rate:10.0f} moves/s   {ops:.2f} scheduler ops/move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Post recorded Telegram updates to a webhook endpoint, the way Telegram does.
+
+Reads one update JSON per line from ``--file`` (or makes ``--synthetic`` draw
+callbacks spread over ``--chats`` chats), sends each one ``--repeat`` times to
+check deduplication, and reports requests/s and the final status codes (503s
+are retried like Telegram does).
+
+Against a running bot (BOT_UPDATES=webhook):
+
+    python benchmarks/replay_updates.py --url http://127.0.0.1:8080/telegram --file updates.jsonl
+
+Without ``--url`` a local ``WebhookServer`` is started whose "handler" sleeps
+``--work-ms``, to compare worker counts:
+
+    python benchmarks/replay_updates.py --synthetic 2000 --workers 1 8 32
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.workers.webhook import SECRET_HEADER, WebhookServer  # noqa: E402
+
+
+def load_updates(path: str | None, synthetic: int, chats: int) -> list[dict]:
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    return [
+        {
+            "update_id": 1000 + i,
+            "callback_query": {
+                "id": str(i),
+                "from": {"id": 1 + i % 4, "is_bot": False, "first_name": "P"},
+                "chat_instance": "bench",
+                "data": f"draw:{-100 - i % chats}",
+            },
+        }
+        for i in range(synthetic)
+    ]
+
+
+def post(url: str, body: bytes, secret: str, retries: int = 50) -> int:
+    """POST ``body``; a 503 (queue full) is retried like Telegram redelivers."""
+    req = urllib.request.Request(url, data=body, method="POST")
+    req.add_header("Content-Type", "application/json")
+    if secret:
+        req.add_header(SECRET_HEADER, secret)
+    for _ in range(retries):
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                return resp.status
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                return e.code
+        time.sleep(0.05)
+    return 503
+
+
+def replay(url: str, updates: list[dict], repeat: int, clients: int, secret: str) -> tuple[float, Counter]:
+    bodies = [json.dumps(u).encode() for u in updates for _ in range(repeat)]
+    codes: Counter = Counter()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for code in pool.map(lambda b: post(url, b, secret), bodies):
+            codes[code] += 1
+    return len(bodies) / (time.perf_counter() - t0), codes
+
+
+def run_local(args, updates: list[dict], workers: int) -> None:
+    processed: Counter = Counter()
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def process(update: dict) -> None:
+        time.sleep(args.work_ms / 1000)
+        with lock:
+            processed[update["update_id"]] += 1
+            if len(processed) == len(updates):
+                done.set()
+
+    server = WebhookServer(
+        process, host="127.0.0.1", port=0, path="/", queue_size=args.queue, workers=workers
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.address
+
+    t0 = time.perf_counter()
+    rate, codes = replay(f"http://{host}:{port}/", updates, args.repeat, args.clients, "")
+    done.wait(timeout=120)
+    elapsed = time.perf_counter() - t0
+    server.shutdown()
+    thread.join()
+
+    twice = sum(1 for n in processed.values() if n > 1)
+    print(
+        f"workers={workers:>3}: {rate:8.0f} req/s, {len(processed) / elapsed:8.0f} updates/s processed"
+        f"   codes={dict(codes)}   processed twice: {twice}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", help="webhook endpoint; omit to start a local server")
+    ap.add_argument("--secret", default="")
+    ap.add_argument("--file", help="recorded updates, one JSON object per line")
+    ap.add_argument("--synthetic", type=int, default=1000)
+    ap.add_argument("--chats", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=2, help="send each update this many times")
+    ap.add_argument("--clients", type=int, default=16)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--work-ms", type=float, default=5.0)
+    ap.add_argument("--queue", type=int, default=10_000)
+    args = ap.parse_args()
+
+    updates = load_updates(args.file, args.synthetic, args.chats)
+    if args.url:
+        rate, codes = replay(args.url, updates, args.repeat, args.clients, args.secret)
+        print(f"{len(updates)} updates x{args.repeat}: {rate:.0f} req/s   codes={dict(codes)}")
+        return
+    for workers in args.workers:
+        run_local(args, updates, workers)
+
+
+if __name__ == "__main__":
+    main()
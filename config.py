@@ -8,6 +8,68 @@ load_dotenv()
 class Settings:
     BOT_TOKEN: str = os.getenv("TOKEN", "your-bot-token-here")
     DB_URL: str = os.getenv("DATABASE_URL", "sqlite:///./uno_bot.db")
+    # connection tuning, see app/utils/storage_profiles.py: auto | sqlite-wal | default
+    DB_PROFILE: str = os.getenv("DB_PROFILE", "auto")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "16"))
+
+    # "seeded": draw pile derived from a per-game seed; "stored": shuffled list in state
+    DECK_MODE: str = os.getenv("DECK_MODE", "seeded")
+
+    # "snapshot": rewrite games.state on every save; "events": one game_events row
+    # per move, games.state is compacted every GAME_SNAPSHOT_EVERY events
+    GAME_PERSISTENCE: str = os.getenv("GAME_PERSISTENCE", "snapshot")
+    GAME_SNAPSHOT_EVERY: int = int(os.getenv("GAME_SNAPSHOT_EVERY", "20"))
+
+    # keep live games in process memory and write them back every few seconds
+    GAME_CACHE: bool = os.getenv("GAME_CACHE", "0") == "1"
+    GAME_CACHE_FLUSH_SECONDS: float = float(os.getenv("GAME_CACHE_FLUSH_SECONDS", "2"))
+
+    # run updates and timer jobs of one chat sequentially on a worker pool
+    CHAT_ACTORS: bool = os.getenv("CHAT_ACTORS", "1") == "1"
+    CHAT_ACTOR_WORKERS: int = int(os.getenv("CHAT_ACTOR_WORKERS", "16"))
+    METRICS_LOG_SECONDS: int = int(os.getenv("METRICS_LOG_SECONDS", "300"))
+    # "sync" (TeleBot + threads) or "async" (AsyncTeleBot + async DB driver)
+    BOT_RUNTIME: str = os.getenv("BOT_RUNTIME", "sync").lower()
+
+    # >0: updates and chat tasks run on this many threads, sharded by chat id
+    # (app/workers/dispatcher.py); sync runtime only
+    DISPATCH_SHARDS: int = int(os.getenv("DISPATCH_SHARDS", "0"))
+
+    # "wheel": hashed timing wheel (one thread, O(1) arm/cancel); "apscheduler": date jobs
+    TIMER_BACKEND: str = os.getenv("TIMER_BACKEND", "wheel")
+    TIMER_TICK_SECONDS: float = float(os.getenv("TIMER_TICK_SECONDS", "0.1"))
+    # never cancel/replace scheduled timeouts on a move; see app/workers/lazy_timers.py
+    TIMER_LAZY: bool = os.getenv("TIMER_LAZY", "1") == "1"
+    # overdue timeouts found at startup fire at most this many per second
+    TIMER_RECOVERY_PER_SECOND: float = float(os.getenv("TIMER_RECOVERY_PER_SECOND", "20"))
+
+    # queue outgoing messages with per-chat/global rate limits (app/workers/outbox.py)
+    OUTBOX: bool = os.getenv("OUTBOX", "1") == "1"
+    OUTBOX_WORKERS: int = int(os.getenv("OUTBOX_WORKERS", "8"))
+    OUTBOX_GLOBAL_PER_SECOND: float = float(os.getenv("OUTBOX_GLOBAL_PER_SECOND", "25"))
+    OUTBOX_GROUP_PER_MINUTE: float = float(os.getenv("OUTBOX_GROUP_PER_MINUTE", "20"))
+    OUTBOX_PRIVATE_PER_SECOND: float = float(os.getenv("OUTBOX_PRIVATE_PER_SECOND", "1"))
+    # "polling" or "webhook": Telegram posts updates to WEBHOOK_URL, served by
+    # app/workers/webhook.py on WEBHOOK_HOST:WEBHOOK_PORT (behind a TLS proxy)
+    BOT_UPDATES: str = os.getenv("BOT_UPDATES", "polling").lower()
+    WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")
+    WEBHOOK_HOST: str = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+    WEBHOOK_PORT: int = int(os.getenv("WEBHOOK_PORT", "8080"))
+    WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")
+    WEBHOOK_QUEUE_SIZE: int = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+    WEBHOOK_WORKERS: int = int(os.getenv("WEBHOOK_WORKERS", "8"))
+
+    # built "Мої карти" inline results kept per (chat, user, game version)
+    INLINE_CACHE_SIZE: int = int(os.getenv("INLINE_CACHE_SIZE", "5000"))
+    # build them in the background right after each save (app/services/hand_prebuilder.py)
+    INLINE_PREBUILD: bool = os.getenv("INLINE_PREBUILD", "1") == "1"
+
+    # off-turn/kicked stickers are deleted in one deleteMessages call per chat and window
+    DELETE_BATCH_SECONDS: float = float(os.getenv("DELETE_BATCH_SECONDS", "1"))
+
+    # edit the game's table message instead of posting a status after every move
+    LIVE_TABLE: bool = os.getenv("LIVE_TABLE", "1") == "1"
+    LIVE_TABLE_DEBOUNCE_SECONDS: float = float(os.getenv("LIVE_TABLE_DEBOUNCE_SECONDS", "1"))
 
     TURN_SECONDS = 30
     UNO_SECONDS = 10
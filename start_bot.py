@@ -1,6 +1,11 @@
-from app.bot import TelegramBot
+from config import settings
 
 
 if __name__ == "__main__":
+    if settings.BOT_RUNTIME == "async":
+        from app.bot import AsyncTelegramBot as TelegramBot
+    else:
+        from app.bot import TelegramBot
+
     bot = TelegramBot()
     bot.start()